@@ -0,0 +1,135 @@
+# Reparto de un presupuesto fijo de agua entre todas las parcelas habilitadas cuando no alcanza para todas.
+# Datos de entrada
+    # • parcelas (ParcelaConRiego con saldo propio) y presupuesto (litros totales a repartir en este ciclo).
+    # • política: "proporcional" (según demanda), "max_min" (equitativo) o "prioridad_cultivo" (pesos por cultivo);
+    #   también se puede pasar una función propia que reciba la lista de parcelas y devuelva un peso por parcela.
+# Operaciones
+    # • asignar(parcelas, presupuesto, politica, prioridades) → lista de (parcela, litros) sin modificar nada.
+    # • aplicar_asignacion(asignacion) → valida toda la asignación y recién después descuenta y registra en
+    #   eventos_riego con modo "asignado".
+# Reglas de negocio
+    # • Solo participan las parcelas que pueden regar (activa, riego habilitado, tasa > 0).
+    # • Ninguna parcela recibe más que su demanda ni más de lo que tiene por encima de umbral_min_litros.
+    # • Las parcelas conectadas a un reservorio comparten su saldo: entre todas no reciben más que lo que tiene el tanque
+    #   por encima del umbral más alto de ellas. Se calcula una vez por tanque el nivel en el que se llenaría su saldo
+    #   y ese nivel pasa a ser un tope más de cada parcela del tanque; así lo que el tanque no puede dar queda para las
+    #   demás en el mismo reparto. aplicar_asignacion() descuenta del tanque.
+    # • El reparto es un "llenado por niveles" con pesos: se ordena una vez por tope/peso (y una vez dentro de cada
+    #   tanque), así que cuesta O(n log n) en total, tengan o no reservorio.
+    # • aplicar_asignacion() rechaza la asignación entera (ValueError, sin regar nada) si alguna parcela ya no puede
+    #   regar o recibiría más de lo que tiene (o tiene su tanque) sobre el umbral. Si el saldo bajó entre la validación
+    #   y el riego (otro hilo), se aplica lo que queda sobre el umbral, nunca se corta a mitad de la lista.
+"""--------------------------------------------------------------------------------------------------------------- """
+from datetime import datetime
+import math
+
+
+def _pesos_proporcionales(parcelas: list, prioridades: dict = None) -> list:
+    return [p.superficieHa * p.tasaRiegoLHa for p in parcelas]
+
+
+def _pesos_max_min(parcelas: list, prioridades: dict = None) -> list:
+    return [1.0] * len(parcelas)
+
+
+def _pesos_por_cultivo(parcelas: list, prioridades: dict = None) -> list:
+    if not prioridades:
+        raise ValueError("La política 'prioridad_cultivo' necesita un diccionario de prioridades por cultivo.")
+    prioridades = {cultivo.strip().lower(): peso for cultivo, peso in prioridades.items()}
+    return [prioridades.get(p.cultivoActual.strip().lower(), 1.0) for p in parcelas]
+
+
+POLITICAS = {
+    "proporcional": _pesos_proporcionales,
+    "max_min": _pesos_max_min,
+    "prioridad_cultivo": _pesos_por_cultivo,
+}
+
+
+def nivel_de_llenado(topes: list, pesos: list, presupuesto: float) -> float:
+    # El nivel más alto tal que sum(min(tope, peso × nivel)) entra en el presupuesto; infinito si alcanza para todos los topes
+    candidatos = [i for i in range(len(topes)) if topes[i] > 0 and pesos[i] > 0]
+    candidatos.sort(key=lambda i: topes[i] / pesos[i])
+
+    restante = presupuesto
+    peso_restante = sum(pesos[i] for i in candidatos)
+    for i in candidatos:
+        nivel = restante / peso_restante
+        if topes[i] / pesos[i] > nivel:
+            return nivel # desde acá ninguna llega a su tope: todas reciben la misma proporción de su peso
+        restante -= topes[i] # a esta parcela le alcanza para todo su tope
+        peso_restante -= pesos[i]
+    return math.inf
+
+
+def repartir_por_niveles(topes: list, pesos: list, presupuesto: float) -> list:
+    # Llenado por niveles con pesos: cada parcela recibe min(tope, peso × nivel), con el nivel más alto que entra en el presupuesto
+    nivel = nivel_de_llenado(topes, pesos, presupuesto)
+    return [0.0 if tope <= 0 or peso <= 0 else min(tope, peso * nivel) for tope, peso in zip(topes, pesos)]
+
+
+def asignar(parcelas: list, presupuesto: float, politica="proporcional", prioridades: dict = None) -> list:
+    if presupuesto < 0:
+        raise ValueError("El presupuesto de agua debe ser mayor o igual a 0.")
+    funcion_pesos = POLITICAS.get(politica) if isinstance(politica, str) else politica
+    if funcion_pesos is None:
+        raise ValueError(f"Política de reparto desconocida: '{politica}'. Use {', '.join(POLITICAS)} o una función.")
+
+    habilitadas = [parcela for parcela in parcelas if parcela._riego_permitido()]
+
+    pesos = list(funcion_pesos(habilitadas, prioridades))
+    if len(pesos) != len(habilitadas) or any(peso < 0 for peso in pesos):
+        raise ValueError("La política debe devolver un peso mayor o igual a 0 por cada parcela.")
+
+    # Tope de cada parcela: su demanda, pero sin dejar su saldo (o el del tanque) por debajo del umbral
+    topes = [max(0, min(p.superficieHa * p.tasaRiegoLHa, p.litrosDisponibles - p.umbralMinLitros)) for p in habilitadas]
+    for posiciones, disponible in _tanques(habilitadas).values():
+        # Nivel en el que las parcelas del tanque se terminan su saldo: más arriba ninguna recibe más
+        nivel = nivel_de_llenado([topes[i] for i in posiciones], [pesos[i] for i in posiciones], disponible)
+        if nivel != math.inf:
+            for i in posiciones:
+                topes[i] = min(topes[i], pesos[i] * nivel)
+    return list(zip(habilitadas, repartir_por_niveles(topes, pesos, presupuesto)))
+
+
+def _tanques(parcelas: list) -> dict:
+    # id(reservorio) → (posiciones de sus parcelas, litros que puede entregar entre todas sin bajar del umbral más alto)
+    posiciones_por_tanque = {}
+    umbral_maximo = {}
+    reservorios = {}
+    for i, parcela in enumerate(parcelas):
+        reservorio = parcela.reservorio
+        if reservorio is not None:
+            clave = id(reservorio)
+            reservorios[clave] = reservorio
+            posiciones_por_tanque.setdefault(clave, []).append(i)
+            umbral_maximo[clave] = max(umbral_maximo.get(clave, 0), parcela.umbralMinLitros)
+    return {clave: (posiciones, max(0, reservorios[clave].litrosDisponibles - umbral_maximo[clave]))
+            for clave, posiciones in posiciones_por_tanque.items()}
+
+
+def validar_asignacion(asignacion: list):
+    # Todo o nada: si una fila no se puede aplicar no se riega ninguna
+    parcelas = [parcela for parcela, _ in asignacion]
+    tolerancia = 1e-6
+    for parcela, litros in asignacion:
+        if litros < 0:
+            raise ValueError(f"La parcela {parcela.idParcela} tiene asignados litros negativos.")
+        if litros > 0 and not parcela._riego_permitido():
+            raise ValueError(f"La parcela {parcela.idParcela} ya no puede regar (inactiva, riego inhabilitado o sin tasa).")
+        if parcela.reservorio is None and litros > parcela.litrosDisponibles - parcela.umbralMinLitros + tolerancia:
+            raise ValueError(f"La parcela {parcela.idParcela} quedaría por debajo de su umbral mínimo.")
+    for posiciones, disponible in _tanques(parcelas).values():
+        if sum(asignacion[i][1] for i in posiciones) > disponible + tolerancia:
+            raise ValueError(f"Las parcelas del reservorio {parcelas[posiciones[0]].reservorio.idReservorio} "
+                             "recibirían más de lo que tiene el tanque sobre el umbral.")
+
+
+def aplicar_asignacion(asignacion: list) -> float:
+    asignacion = list(asignacion)
+    validar_asignacion(asignacion)
+    fecha = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    total = 0
+    for parcela, litros in asignacion:
+        total += parcela._aplicar_riego_calculado(parcela.superficieHa * parcela.tasaRiegoLHa, litros, "asignado", fecha)
+    return total
@@ -0,0 +1,169 @@
+# Carga masiva de parcelas y de entregas de agua desde archivos CSV o JSONL.
+# Archivos
+    # • parcelas: columnas id_parcela, superficie_ha, cultivo_actual y opcionales tasa_riego_l_ha, umbral_min_litros.
+    # • cargas de agua: columnas id_parcela, litros.
+# Operaciones
+    # • leer_filas(ruta, rechazo) → generador de (número de línea, fila) según la extensión (.csv o .jsonl).
+    # • cargar_parcelas(ruta) → valida con las mismas reglas que Parcela.__init__ y crea las ParcelaConRiego sin imprimir.
+    # • cargar_agua_desde(ruta, tamanio_lote) → aplica las cargas por lotes, con el historial escrito por bloques.
+# Reglas de negocio
+    # • Todo se procesa como una cadena de generadores: nunca se tiene el archivo completo en memoria.
+    # • Las filas inválidas no cortan la carga; se informan a la función rechazo(linea, fila, motivo) si se pasa una.
+    #   Una línea JSONL mal formada también es una fila inválida (llega a rechazo con el texto de la línea).
+    # • Los números deben ser finitos: "nan" o "inf" se rechazan aunque float() los acepte.
+    # • id_parcela debe ser entero (9002.7 o true se rechazan, no se truncan) y cultivo_actual un texto.
+    # • Solo se silencian los mensajes de los constructores; rechazo() se llama fuera de ese bloque y puede imprimir.
+"""--------------------------------------------------------------------------------------------------------------- """
+import contextlib
+import csv
+import itertools
+import json
+import math
+import os
+from datetime import datetime
+
+from Clases.Parcela import Parcela
+from Clases.ParcelaConRiego import ParcelaConRiego
+
+
+def leer_filas(ruta: str, rechazo=None):
+    extension = os.path.splitext(ruta)[1].lower()
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        if extension == ".csv":
+            for numero, fila in enumerate(csv.DictReader(archivo), start=2): # la línea 1 es el encabezado
+                yield numero, fila
+        elif extension in (".jsonl", ".ndjson"):
+            for numero, linea in enumerate(archivo, start=1):
+                if not linea.strip():
+                    continue
+                try:
+                    fila = json.loads(linea)
+                except json.JSONDecodeError as e:
+                    if rechazo is not None:
+                        rechazo(numero, linea.rstrip("\n"), f"JSON inválido: {e}")
+                    continue
+                yield numero, fila
+        else:
+            raise ValueError(f"Formato de archivo no soportado: '{extension}'. Use .csv o .jsonl.")
+
+
+def _numero(valor, campo: str) -> float:
+    if isinstance(valor, bool): # float(True) sería 1.0
+        raise ValueError(f"El campo '{campo}' debe ser un número.")
+    numero = float(valor)
+    if not math.isfinite(numero):
+        raise ValueError(f"El campo '{campo}' debe ser un número finito.")
+    return numero
+
+
+def _entero(valor, campo: str) -> int:
+    # Acepta 12, "12" o 12.0; rechaza 12.7, "12.7" y booleanos en vez de truncarlos
+    if isinstance(valor, bool):
+        raise ValueError(f"El campo '{campo}' debe ser un número entero.")
+    if isinstance(valor, str):
+        valor = valor.strip()
+        try:
+            return int(valor)
+        except ValueError:
+            pass
+    numero = _numero(valor, campo)
+    if not numero.is_integer():
+        raise ValueError(f"El campo '{campo}' debe ser un número entero.")
+    return int(numero)
+
+
+def _texto(valor, campo: str) -> str:
+    if valor is None:
+        return ""
+    if not isinstance(valor, str):
+        raise ValueError(f"El campo '{campo}' debe ser un texto.")
+    return valor.strip()
+
+
+def _numero_opcional(fila: dict, campo: str):
+    valor = fila.get(campo)
+    if valor is None or valor == "":
+        return None
+    return _numero(valor, campo)
+
+
+def validar_parcelas(filas, rechazo=None):
+    # Convierte tipos y aplica Parcela._validar_datos; deja pasar solo las filas válidas
+    for numero, fila in filas:
+        try:
+            if not isinstance(fila, dict):
+                raise ValueError("La fila debe ser un objeto con campos (ej: {\"id_parcela\": 1, ...}).")
+            datos = {
+                "id_parcela": _entero(fila["id_parcela"], "id_parcela"),
+                "superficie_ha": _numero(fila["superficie_ha"], "superficie_ha"),
+                "cultivo_actual": _texto(fila.get("cultivo_actual"), "cultivo_actual"),
+                "tasa_riego_l_ha": _numero_opcional(fila, "tasa_riego_l_ha"),
+                "umbral_min_litros": _numero_opcional(fila, "umbral_min_litros"),
+            }
+            Parcela._validar_datos(datos["id_parcela"], datos["superficie_ha"], datos["cultivo_actual"])
+            if datos["tasa_riego_l_ha"] is not None and datos["tasa_riego_l_ha"] <= 0:
+                raise ValueError("La tasa de riego debe ser un número mayor a 0")
+            if datos["umbral_min_litros"] is not None and datos["umbral_min_litros"] < 0:
+                raise ValueError("Umbral mínimo de litros debe ser un número mayor o igual a 0.")
+        except (KeyError, TypeError, ValueError) as e:
+            if rechazo is not None:
+                rechazo(numero, fila, str(e))
+            continue
+        yield datos
+
+
+def cargar_parcelas(ruta: str, rechazo=None) -> int:
+    cargadas = 0
+    # Los constructores y configurar_* imprimen mensajes; en una carga masiva se descartan. La validación (y con ella
+    # rechazo) corre fuera del redirect, así lo que imprima rechazo sí se ve.
+    with open(os.devnull, "w") as nulo:
+        for datos in validar_parcelas(leer_filas(ruta, rechazo), rechazo):
+            with contextlib.redirect_stdout(nulo):
+                parcela = ParcelaConRiego(datos["id_parcela"], datos["superficie_ha"], datos["cultivo_actual"])
+                if datos["tasa_riego_l_ha"] is not None:
+                    parcela.configurar_tasa(datos["tasa_riego_l_ha"])
+                if datos["umbral_min_litros"] is not None:
+                    parcela.configurar_umbral(datos["umbral_min_litros"])
+            cargadas += 1
+    return cargadas
+
+
+def validar_cargas(filas, rechazo=None):
+    for numero, fila in filas:
+        try:
+            if not isinstance(fila, dict):
+                raise ValueError("La fila debe ser un objeto con campos (ej: {\"id_parcela\": 1, ...}).")
+            id_parcela = _entero(fila["id_parcela"], "id_parcela")
+            litros = _numero(fila["litros"], "litros")
+            parcela = Parcela._parcelas_existentes.get(id_parcela)
+            if not isinstance(parcela, ParcelaConRiego):
+                raise ValueError(f"No existe una parcela con riego con ID '{id_parcela}'.")
+            if litros <= 0:
+                raise ValueError("La cantidad a cargar debe ser mayor a 0 litros.")
+        except (KeyError, TypeError, ValueError) as e:
+            if rechazo is not None:
+                rechazo(numero, fila, str(e))
+            continue
+        yield parcela, litros
+
+
+def cargar_agua_desde(ruta: str, tamanio_lote: int = 10000, rechazo=None) -> float:
+    if tamanio_lote <= 0:
+        raise ValueError("El tamaño de lote debe ser mayor a 0.")
+
+    total = 0
+    cargas = validar_cargas(leer_filas(ruta, rechazo), rechazo)
+    while True:
+        lote = list(itertools.islice(cargas, tamanio_lote)) # solo un lote a la vez en memoria
+        if not lote:
+            break
+
+        # Se agrupan las cargas del lote por parcela (respetando el orden) para sumar y escribir historial una vez por parcela
+        por_parcela = {}
+        for parcela, litros in lote:
+            por_parcela.setdefault(parcela, []).append(litros)
+
+        fecha = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        for parcela, litros in por_parcela.items():
+            total += parcela._cargar_agua_lote(litros, fecha)
+    return total
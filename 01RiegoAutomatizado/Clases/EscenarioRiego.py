@@ -0,0 +1,153 @@
+# Escenarios "¿qué pasaría si...?" sobre una flota de riego, con copia perezosa (copy-on-write).
+# Datos
+    # • columnas numéricas (tasa, umbral, litros) compartidas con el escenario padre hasta que se modifican.
+    # • eventos_riego por capas: el historial real de cada parcela (hasta el momento de crear el escenario),
+    #   las capas congeladas que comparte con sus padres/hermanos y una capa propia donde escribe.
+# Operaciones
+    # • EscenarioRiego.desde_flota(flota) → escenario raíz; bifurcar() → escenario hijo.
+    # • configurar_tasa / configurar_umbral / cargar_agua (para ids dados o toda la flota) y regar_automatico(modo).
+    # • eventos_riego(id_parcela) → iterador sobre el historial del escenario, sin copiar listas.
+    # • resumen() → totales para comparar escenarios.
+# Reglas de negocio
+    # • Nada de lo que se hace en un escenario toca las parcelas reales ni a su padre.
+    # • Al bifurcar, la capa propia se congela y pasa a ser compartida; padre e hijo siguen cada uno en una capa nueva.
+    # • Se validan los mismos valores que en ParcelaConRiego (tasa > 0, umbral ≥ 0, carga > 0).
+"""--------------------------------------------------------------------------------------------------------------- """
+import itertools
+from datetime import datetime
+
+import numpy as np
+
+from Clases.FlotaRiego import MODOS_RIEGO, calcular_riego
+
+
+class EscenarioRiego:
+
+    def __init__(self, ids: tuple, posiciones: dict, superficie, habilitada, columnas: dict, base: tuple, capas: tuple, nombre: str):
+        # No se llama directo: usar desde_flota() o bifurcar()
+        self.__ids = ids                   # compartido entre todos los escenarios de la misma flota
+        self.__posiciones = posiciones     # id → índice, compartido
+        self.__superficie = superficie     # no cambia en los escenarios, compartido
+        self.__habilitada = habilitada     # activa y con riego habilitado, compartido
+        self.__columnas = columnas         # "tasa", "umbral", "litros" → arreglo (compartido hasta que se escribe)
+        self.__columnas_propias = set()
+        self.__base = base                 # por parcela: (lista real de eventos, largo al crear el escenario raíz)
+        self.__capas = capas               # capas congeladas: dict índice → lista de eventos
+        self.__capa_propia = {}
+        self.__nombre = nombre
+        self.__hijos = itertools.count(1)
+
+    @classmethod
+    def desde_flota(cls, flota, nombre: str = "base"):
+        parcelas = flota.parcelas
+        columnas = flota.columnas()
+        base = tuple((lista, len(lista)) for lista in (p._eventos_internos() for p in parcelas))
+        habilitada = np.array([p.estado == "activo" and p.estadoRiego == "habilitado" for p in parcelas], dtype=bool)
+        ids = tuple(p.idParcela for p in parcelas)
+        return cls(ids, {id_parcela: i for i, id_parcela in enumerate(ids)}, columnas["superficie_ha"], habilitada,
+                   {"tasa": columnas["tasa_riego_l_ha"], "umbral": columnas["umbral_min_litros"],
+                    "litros": columnas["litros_disponibles"]}, base, (), nombre)
+
+    """ Getters--------------------------------------------------------------------------------------------------------------- """
+    @property
+    def nombre(self):
+        return self.__nombre
+
+    @property
+    def litrosDisponibles(self):
+        return self.__columnas["litros"].copy()
+
+    @property
+    def tasaRiegoLHa(self):
+        return self.__columnas["tasa"].copy()
+
+    @property
+    def umbralMinLitros(self):
+        return self.__columnas["umbral"].copy()
+
+    """ Métodos--------------------------------------------------------------------------------------------------------------- """
+    def bifurcar(self, nombre: str = None):
+        if self.__capa_propia:
+            self.__capas = self.__capas + (self.__capa_propia,) # se congela: desde ahora la comparten padre e hijo
+            self.__capa_propia = {}
+        self.__columnas_propias = set() # el hijo comparte los arreglos, así que el padre también tiene que copiar antes de escribir
+
+        nombre = nombre or f"{self.__nombre}.{next(self.__hijos)}"
+        return EscenarioRiego(self.__ids, self.__posiciones, self.__superficie, self.__habilitada, dict(self.__columnas),
+                              self.__base, self.__capas, nombre)
+
+    def __columna_para_escribir(self, campo: str):
+        if campo not in self.__columnas_propias:
+            self.__columnas[campo] = self.__columnas[campo].copy()
+            self.__columnas_propias.add(campo)
+        return self.__columnas[campo]
+
+    def __indices(self, ids=None):
+        if ids is None:
+            return slice(None)
+        try:
+            return np.array([self.__posiciones[id_parcela] for id_parcela in ids], dtype=int)
+        except KeyError as e:
+            raise ValueError(f"La parcela {e.args[0]} no forma parte del escenario.")
+
+    def configurar_tasa(self, l_ha: float, ids=None):
+        if l_ha <= 0:
+            raise ValueError("La tasa de riego debe ser un número mayor a 0")
+        self.__columna_para_escribir("tasa")[self.__indices(ids)] = l_ha
+
+    def configurar_umbral(self, litros: float, ids=None):
+        if litros < 0:
+            raise ValueError("Umbral mínimo de litros debe ser un número mayor o igual a 0.")
+        self.__columna_para_escribir("umbral")[self.__indices(ids)] = litros
+
+    def cargar_agua(self, litros: float, ids=None):
+        if litros <= 0:
+            raise ValueError("La cantidad a cargar debe ser mayor a 0 litros.")
+        self.__columna_para_escribir("litros")[self.__indices(ids)] += litros
+
+    def regar_automatico(self, modo: str):
+        if modo not in MODOS_RIEGO:
+            raise ValueError("Modo de riego inválido. Use 'estricto' o 'parcial'.")
+
+        tasa = self.__columnas["tasa"]
+        demanda = self.__superficie * tasa
+        permitido = self.__habilitada & (tasa > 0)
+        saldo_antes = self.__columnas["litros"]
+        aplicados = calcular_riego(saldo_antes, demanda, self.__columnas["umbral"], permitido, modo)
+        saldo_despues = saldo_antes - aplicados
+        self.__columnas["litros"] = saldo_despues # arreglo nuevo, así que ya es propio
+        self.__columnas_propias.add("litros")
+
+        fecha = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        indices = np.flatnonzero(aplicados > 0)
+        for i, solicitado, aplicado, antes, despues in zip(indices.tolist(), demanda[indices].tolist(), aplicados[indices].tolist(),
+                                                          saldo_antes[indices].tolist(), saldo_despues[indices].tolist()):
+            self.__capa_propia.setdefault(i, []).append({
+                "fecha": fecha,
+                "litros_solicitados": solicitado,
+                "litros_aplicados": aplicado,
+                "saldo_antes": antes,
+                "saldo_despues": despues,
+                "modo": modo
+            })
+        return aplicados
+
+    def eventos_riego(self, id_parcela):
+        i = self.__posiciones.get(id_parcela)
+        if i is None:
+            raise ValueError(f"La parcela {id_parcela} no forma parte del escenario.")
+        lista_real, largo = self.__base[i]
+        return itertools.chain(itertools.islice(lista_real, largo),
+                               *(capa[i] for capa in self.__capas if i in capa),
+                               self.__capa_propia.get(i, ()))
+
+    def resumen(self) -> dict:
+        litros = self.__columnas["litros"]
+        aplicado = sum(evento["litros_aplicados"] for capa in self.__capas + (self.__capa_propia,)
+                       for eventos in capa.values() for evento in eventos)
+        return {
+            "escenario": self.__nombre,
+            "litros_totales": float(litros.sum()),
+            "litros_aplicados_en_escenarios": aplicado,
+            "parcelas_bajo_umbral": int((litros < self.__columnas["umbral"]).sum()),
+        }
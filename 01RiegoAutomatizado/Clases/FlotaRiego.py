@@ -0,0 +1,119 @@
+# Motor de riego para muchas parcelas a la vez (flota).
+# Datos
+    # • parcelas (lista de ParcelaConRiego que forman la flota).
+    # • columnas NumPy: superficie_ha, tasa_riego_l_ha, umbral_min_litros, litros_disponibles y permitido.
+# Operaciones
+    # • sincronizar() → vuelve a leer las columnas desde los objetos (por si se cargó agua o se cambió la tasa).
+    # • regar_automatico(modo) → mismo cálculo que ParcelaConRiego.regar_automatico pero para toda la flota en una pasada.
+# Reglas de negocio
+    # • Se respetan las mismas reglas que en la parcela: inactiva, riego inhabilitado o tasa ≤ 0 → no se riega.
+    # • estricto: aplica solo si litros_disponibles - demanda ≥ umbral; parcial: aplica lo máximo dejando el umbral.
+    # • El cálculo es vectorizado; la escritura de eventos_riego es un recorrido por parcela (cada una tiene su lista y su
+    #   lock), con una sola fecha para todo el ciclo y sin imprimir. Es la parte que domina el costo (~0,7 s cada 100 mil).
+    # • Si una parcela se cargó o regó por fuera del motor desde el último sincronizar(), se riega con su saldo real.
+    #   Las columnas se actualizan después de escribir en cada parcela, nunca antes.
+    # • Los rechazos (parcelas habilitadas que no recibieron agua) se cuentan en los resúmenes, como en la parcela.
+"""--------------------------------------------------------------------------------------------------------------- """
+from datetime import datetime
+import numpy as np
+
+from Clases.ParcelaConRiego import ParcelaConRiego
+
+MODOS_RIEGO = ("estricto", "parcial")
+
+
+def calcular_riego(saldo, demanda, umbral, permitido, modo: str):
+    # Versión vectorizada de regar_automatico: devuelve los litros aplicados por parcela
+    if modo == "estricto":
+        aplicados = np.where(saldo - demanda >= umbral, demanda, 0.0)
+    else:
+        maximo_aplicable = saldo - umbral
+        aplicados = np.where(maximo_aplicable <= 0, 0.0, np.minimum(maximo_aplicable, demanda))
+    return np.where(permitido, aplicados, 0.0) #Si el riego no está permitido no se aplica nada
+
+
+def aplicar_en_parcelas(parcelas: list, indices, demanda, umbral, aplicados, litros, modo: str, fecha: str):
+    # Escribe un ciclo ya calculado en los objetos. Cada parcela compara su saldo real con la columna (dentro de su
+    # lock) y, si cambió por fuera del motor, recalcula con el saldo real. Recién después se actualizan las columnas
+    # aplicados y litros (se modifican en el lugar) con lo que quedó en cada objeto, y el resumen de la flota se
+    # actualiza una sola vez. Es un recorrido en Python por parcela: cada una guarda sus propios eventos.
+    total = 0.0
+    riegos = rechazos = 0
+    for i, solicitado, umbral_i, calculado, saldo in zip(indices.tolist(), demanda[indices].tolist(), umbral[indices].tolist(),
+                                                          aplicados[indices].tolist(), litros[indices].tolist()):
+        resultado = parcelas[i]._regar_calculado(solicitado, umbral_i, calculado, saldo, modo, fecha, contar_en_flota=False)
+        if resultado is None: # dejó de poder regar desde la última sincronización
+            aplicados[i] = 0.0
+            continue
+        aplicados[i], litros[i] = resultado
+        if resultado[0] > 0:
+            total += resultado[0]
+            riegos += 1
+        else:
+            rechazos += 1
+    if riegos or rechazos:
+        ParcelaConRiego.resumen_flota().registrar_lote(fecha, total, modo, riegos, rechazos)
+    return aplicados
+
+
+class FlotaRiego:
+
+    def __init__(self, parcelas: list):
+        if not parcelas:
+            raise ValueError("La flota debe tener al menos una parcela.")
+
+        self.__parcelas = list(parcelas)
+        n = len(self.__parcelas)
+        self.__superficie = np.zeros(n)
+        self.__tasa = np.zeros(n)
+        self.__umbral = np.zeros(n)
+        self.__litros = np.zeros(n)
+        self.__permitido = np.zeros(n, dtype=bool)
+        self.sincronizar()
+
+    """ Getters--------------------------------------------------------------------------------------------------------------- """
+    @property
+    def parcelas(self):
+        return list(self.__parcelas)
+
+    @property
+    def litrosDisponibles(self):
+        return self.__litros.copy() # copia, igual que en la parcela no se puede editar directo
+
+    @property
+    def demanda(self):
+        return self.__superficie * self.__tasa
+
+    def columnas(self) -> dict:
+        # Copias de las columnas, para cálculos que no deben tocar la flota (ej: SimuladorRiego)
+        return {
+            "superficie_ha": self.__superficie.copy(),
+            "tasa_riego_l_ha": self.__tasa.copy(),
+            "umbral_min_litros": self.__umbral.copy(),
+            "litros_disponibles": self.__litros.copy(),
+            "permitido": self.__permitido.copy(),
+        }
+
+    """ Métodos--------------------------------------------------------------------------------------------------------------- """
+    def sincronizar(self):
+        #Se releen las columnas desde cada parcela, se llama cuando se modificó algo por fuera del motor
+        for i, parcela in enumerate(self.__parcelas):
+            if parcela.reservorio is not None:
+                raise ValueError(f"La parcela {parcela.idParcela} usa un reservorio compartido; la flota solo maneja saldos propios.")
+            self.__superficie[i] = parcela.superficieHa
+            self.__tasa[i] = parcela.tasaRiegoLHa
+            self.__umbral[i] = parcela.umbralMinLitros
+            self.__litros[i] = parcela.litrosDisponibles
+            self.__permitido[i] = parcela._riego_permitido()
+
+    def regar_automatico(self, modo: str):
+        if modo not in MODOS_RIEGO:
+            print("Modo de riego inválido. Use 'estricto' o 'parcial'.")
+            return np.zeros(len(self.__parcelas))
+
+        demanda = self.__superficie * self.__tasa
+        aplicados = calcular_riego(self.__litros, demanda, self.__umbral, self.__permitido, modo)
+        # Las columnas no se tocan hasta que cada parcela confirmó lo que realmente se le aplicó
+        fecha = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return aplicar_en_parcelas(self.__parcelas, np.flatnonzero(self.__permitido), demanda, self.__umbral,
+                                   aplicados, self.__litros, modo, fecha)
@@ -0,0 +1,116 @@
+# Instantánea binaria de la flota de riego para reiniciar rápido el servicio.
+# Formato del archivo
+    # • encabezado: firma, versión y cantidad de parcelas.
+    # • tabla de registros de tamaño fijo (uno por parcela): id, superficie, tasa, umbral, litros, estado, estado_riego
+    #   y la posición/largo de cultivo, historial_eventos, eventos_riego y resumen de riego dentro de la zona de datos.
+    # • zona de datos: textos en UTF-8 y los historiales en JSON.
+# Operaciones
+    # • guardar_instantanea(parcelas, ruta) → escribe el archivo.
+    # • cargar_instantanea(ruta) → mapea el archivo en memoria (mmap) y reconstruye las ParcelaConRiego.
+# Reglas de negocio
+    # • Al cargar solo se leen los datos numéricos y el cultivo; los historiales se decodifican recién cuando
+    #   alguien lee historialEventos o eventosRiego (carga perezosa desde el mmap).
+    # • El resumen de riego (ResumenRiego) sí se lee al cargar: es chico y se suma al resumen de la flota. Se decodifica
+    #   y valida junto con el resto de los registros, antes de restaurar la primera parcela.
+    # • Los ids deben seguir siendo únicos: si ya existe una parcela con ese id (o el archivo lo repite), la carga falla.
+    #   Todos los registros se validan antes de crear la primera parcela, así una carga fallida no deja nada a medias
+    #   en el registro de parcelas ni en el resumen de la flota.
+    # • La conexión a reservorios compartidos y el modelo de demanda no se guardan; hay que volver a asignarlos después de cargar.
+"""--------------------------------------------------------------------------------------------------------------- """
+import json
+import mmap
+import struct
+
+from Clases.Parcela import Parcela
+from Clases.ParcelaConRiego import ParcelaConRiego
+from Clases.ResumenRiego import ResumenRiego
+
+FIRMA = b"RIEGOSNP"
+VERSION = 2
+ENCABEZADO = struct.Struct("<8sII")              # firma, versión, cantidad de parcelas
+REGISTRO = struct.Struct("<qddddBBQIQIQIQI")       # ver descripción arriba
+ESTADOS = ("inactivo", "activo")
+ESTADOS_RIEGO = ("inhabilitado", "habilitado")
+
+
+def guardar_instantanea(parcelas: list, ruta: str):
+    parcelas = list(parcelas)
+    inicio_datos = ENCABEZADO.size + REGISTRO.size * len(parcelas)
+
+    with open(ruta, "wb") as archivo:
+        archivo.write(ENCABEZADO.pack(FIRMA, VERSION, len(parcelas)))
+        archivo.seek(inicio_datos) # primero los datos variables, la tabla se escribe al final cuando se conocen las posiciones
+        posicion = inicio_datos
+        registros = []
+
+        for parcela in parcelas:
+            bloques = []
+            for contenido in (parcela.cultivoActual.encode("utf-8"),
+                              json.dumps(parcela.historialEventos, ensure_ascii=False).encode("utf-8"),
+                              json.dumps(parcela.eventosRiego, ensure_ascii=False).encode("utf-8"),
+                              json.dumps(parcela.resumenRiego.a_diccionario()).encode("utf-8")):
+                archivo.write(contenido)
+                bloques += [posicion, len(contenido)]
+                posicion += len(contenido)
+
+            registros.append(REGISTRO.pack(
+                parcela.idParcela, parcela.superficieHa, parcela.tasaConfiguradaLHa, parcela.umbralMinLitros,
+                # Si la parcela usa un reservorio compartido se guarda su saldo propio, no el del tanque
+                parcela.litrosPropios,
+                ESTADOS.index(parcela.estado), ESTADOS_RIEGO.index(parcela.estadoRiego), *bloques))
+
+        archivo.seek(ENCABEZADO.size)
+        archivo.write(b"".join(registros))
+
+
+def _lector_json(mapa, posicion: int, largo: int):
+    # Devuelve la función que decodifica el bloque recién cuando se la llama
+    return lambda: json.loads(mapa[posicion:posicion + largo])
+
+
+def _leer_resumen(mapa, posicion: int, largo: int, id_parcela: int) -> dict:
+    try:
+        return ResumenRiego.validar_diccionario(json.loads(mapa[posicion:posicion + largo]))
+    except ValueError as e: # json.JSONDecodeError y UnicodeDecodeError también son ValueError
+        raise ValueError(f"Resumen de riego dañado en la parcela '{id_parcela}' de la instantánea: {e}") from None
+
+
+def _validar_registros(registros: list, cultivos: list):
+    # Las mismas reglas que _restaurar, pero para todo el archivo antes de registrar la primera parcela
+    vistos = set()
+    for cultivo, (id_parcela, superficie, tasa, umbral, litros, estado, estado_riego, *_) in zip(cultivos, registros):
+        if id_parcela in vistos:
+            raise ValueError(f"El ID de parcela '{id_parcela}' está repetido en la instantánea.")
+        vistos.add(id_parcela)
+        Parcela._validar_datos(id_parcela, superficie, cultivo)
+        if litros < 0 or umbral < 0 or tasa < 0:
+            raise ValueError("Los datos de riego restaurados no pueden ser negativos.")
+        if estado >= len(ESTADOS) or estado_riego >= len(ESTADOS_RIEGO):
+            raise ValueError(f"Estado inválido en la parcela '{id_parcela}' de la instantánea.")
+
+
+def cargar_instantanea(ruta: str) -> list:
+    with open(ruta, "rb") as archivo:
+        mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) # el mmap sigue vivo aunque se cierre el archivo
+
+    firma, version, cantidad = ENCABEZADO.unpack_from(mapa, 0)
+    if firma != FIRMA or version != VERSION:
+        raise ValueError(f"El archivo '{ruta}' no es una instantánea de riego válida (versión {VERSION}).")
+
+    registros = list(REGISTRO.iter_unpack(mapa[ENCABEZADO.size:ENCABEZADO.size + REGISTRO.size * cantidad]))
+    cultivos = [mapa[registro[7]:registro[7] + registro[8]].decode("utf-8") for registro in registros]
+    resumenes = [_leer_resumen(mapa, registro[13], registro[14], registro[0]) for registro in registros]
+    _validar_registros(registros, cultivos)
+
+    parcelas = []
+    for cultivo, resumen, (id_parcela, superficie, tasa, umbral, litros, estado, estado_riego,
+                           _, _, pos_historial, largo_historial, pos_eventos, largo_eventos,
+                           _, _) in zip(cultivos, resumenes, registros):
+        parcelas.append(ParcelaConRiego._restaurar(
+            id_parcela, superficie, cultivo, ESTADOS[estado],
+            cargar_historial=_lector_json(mapa, pos_historial, largo_historial),
+            litros_disponibles=litros, tasa_riego_l_ha=tasa, umbral_min_litros=umbral,
+            estado_riego=ESTADOS_RIEGO[estado_riego],
+            cargar_eventos=_lector_json(mapa, pos_eventos, largo_eventos),
+            resumen=resumen))
+    return parcelas
@@ -0,0 +1,105 @@
+# Modelo de demanda de riego según cultivo y temporada.
+# Datos
+    # • coeficientes: (cultivo, temporada) → L/ha. Se normalizan sin mayúsculas ni espacios de más.
+    # • temporada actual y la tabla precalculada cultivo → L/ha para esa temporada.
+    # • caché de demanda por parcela (id → litros).
+# Operaciones
+    # • tasa(cultivo) → L/ha de la temporada actual (None si el cultivo no está en la tabla).
+    # • demanda(parcela) → superficie × tasa, guardada en caché.
+    # • invalidar(parcela) → la llama ParcelaConRiego cuando cambia el cultivo, la superficie o la tasa configurada.
+    # • actualizar_coeficiente(cultivo, temporada, l_ha) → invalida solo las parcelas de ese cultivo.
+    # • cambiar_temporada(temporada) → recalcula la tabla e invalida todo.
+    # • recalcular_flota(parcelas) → recalcula la demanda de todas en una pasada vectorizada.
+# Reglas de negocio
+    # • Los coeficientes deben ser > 0 (igual que configurar_tasa).
+    # • Si el cultivo no está en la tabla, la parcela usa la tasa que se le configuró a mano.
+"""--------------------------------------------------------------------------------------------------------------- """
+import numpy as np
+
+from Clases.Parcela import Parcela
+
+
+def _normalizar(texto: str) -> str:
+    return texto.strip().lower()
+
+
+class ModeloDemanda:
+
+    def __init__(self, coeficientes: dict, temporada: str):
+        if not temporada or not temporada.strip():
+            raise ValueError("La temporada no puede estar vacía.")
+
+        self.__coeficientes = {}
+        for (cultivo, estacion), l_ha in coeficientes.items():
+            self.__validar(cultivo, estacion, l_ha)
+            self.__coeficientes[(_normalizar(cultivo), _normalizar(estacion))] = l_ha
+        self.__temporada = _normalizar(temporada)
+        self.__tabla = {}
+        self.__cache = {}
+        self.__armar_tabla()
+
+    """ Getters--------------------------------------------------------------------------------------------------------------- """
+    @property
+    def temporada(self):
+        return self.__temporada
+
+    """ Métodos--------------------------------------------------------------------------------------------------------------- """
+    @staticmethod
+    def __validar(cultivo: str, temporada: str, l_ha: float):
+        if not cultivo or not cultivo.strip() or not temporada or not temporada.strip():
+            raise ValueError("El cultivo y la temporada no pueden estar vacíos.")
+        if l_ha <= 0:
+            raise ValueError("La tasa de riego debe ser un número mayor a 0")
+
+    def __armar_tabla(self):
+        # Tabla precalculada solo con la temporada actual, para que tasa() sea una búsqueda directa
+        self.__tabla = {cultivo: l_ha for (cultivo, estacion), l_ha in self.__coeficientes.items() if estacion == self.__temporada}
+
+    def tasa(self, cultivo: str):
+        return self.__tabla.get(_normalizar(cultivo))
+
+    def demanda(self, parcela) -> float:
+        demanda = self.__cache.get(parcela.idParcela)
+        if demanda is None:
+            demanda = parcela.superficieHa * parcela.tasaRiegoLHa # tasaRiegoLHa ya consulta este modelo
+            self.__cache[parcela.idParcela] = demanda
+        return demanda
+
+    def invalidar(self, parcela):
+        self.__cache.pop(parcela.idParcela, None)
+
+    def actualizar_coeficiente(self, cultivo: str, temporada: str, l_ha: float):
+        self.__validar(cultivo, temporada, l_ha)
+        self.__coeficientes[(_normalizar(cultivo), _normalizar(temporada))] = l_ha
+        if _normalizar(temporada) != self.__temporada:
+            return # no cambia nada de lo que está en uso
+
+        self.__tabla[_normalizar(cultivo)] = l_ha
+        # Solo se invalidan las parcelas de ese cultivo, usando el índice del registro de parcelas
+        for id_parcela in Parcela._parcelas_existentes.ids_por("cultivo_actual", cultivo):
+            self.__cache.pop(id_parcela, None)
+
+    def cambiar_temporada(self, temporada: str):
+        if not temporada or not temporada.strip():
+            raise ValueError("La temporada no puede estar vacía.")
+        self.__temporada = _normalizar(temporada)
+        self.__armar_tabla()
+        self.__cache.clear()
+
+    def recalcular_flota(self, parcelas: list):
+        parcelas = list(parcelas)
+        n = len(parcelas)
+        superficies = np.fromiter((p.superficieHa for p in parcelas), dtype=float, count=n)
+        tasas_manuales = np.fromiter((p.tasaConfiguradaLHa for p in parcelas), dtype=float, count=n)
+
+        # Un coeficiente por cultivo distinto, y cada parcela apunta a la posición de su cultivo
+        posiciones = {}
+        indices = np.fromiter((posiciones.setdefault(_normalizar(p.cultivoActual), len(posiciones)) for p in parcelas),
+                              dtype=int, count=n)
+        coeficientes = np.array([self.__tabla.get(cultivo, np.nan) for cultivo in posiciones], dtype=float)
+
+        tasas = coeficientes[indices] if n else np.zeros(0)
+        tasas = np.where(np.isnan(tasas), tasas_manuales, tasas) # sin coeficiente → tasa configurada a mano
+        demandas = superficies * tasas
+        self.__cache.update(zip((p.idParcela for p in parcelas), demandas.tolist()))
+        return demandas
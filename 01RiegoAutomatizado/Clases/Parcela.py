@@ -15,14 +15,31 @@
 """--------------------------------------------------------------------------------------------------------------- """
 
 from datetime import datetime
+from Clases.RegistroParcelas import RegistroParcelas
 
 class Parcela:
-    _parcelas_existentes = {} # Según entiendo, esto se llama atributo de clase. En este caso, está permitiendo almacenar los id's para evitar duplicados. 
+    _parcelas_existentes = RegistroParcelas() # Según entiendo, esto se llama atributo de clase. En este caso, está permitiendo almacenar los id's para evitar duplicados. 
+    # Ahora es un RegistroParcelas: se usa igual que el diccionario (id in ..., [id]) pero además mantiene índices por cultivo, estado y estado_riego
 #Se ubica antes del constructor, porque si estuviese dentro, sería un atributo del objeto, lo que al crear un nuevo objeto haría que el dicc se reinicie
     estados_permitidos = {"activo", "inactivo"}
 
     def __init__(self, id_parcela: int, superficie_ha: float, cultivo_actual:str):
         
+        Parcela._validar_datos(id_parcela, superficie_ha, cultivo_actual)
+        
+        self.__id_parcela = id_parcela
+        self.__superficie_ha = round(superficie_ha, 2) # Acá se cummple con lo de los 2 decimales
+        self.__cultivo_actual = cultivo_actual
+        self.__estado = "activo" #Por defecto según lo pide el ejericcio
+        self.__historial_eventos = []
+        self.__historial_pendiente = None # Solo se usa al restaurar desde una instantánea (carga perezosa)
+
+        Parcela._parcelas_existentes.registrar(self)
+        self.__registrar_evento("Creación", f"Parcela creada con cultivo '{cultivo_actual}' y superficie {superficie_ha} ha.")
+
+    @staticmethod
+    def _validar_datos(id_parcela: int, superficie_ha: float, cultivo_actual: str):
+        # Las validaciones del constructor quedan acá para poder reutilizarlas (ej: al cargar parcelas desde un archivo)
         if id_parcela in Parcela._parcelas_existentes:
             raise ValueError(f"El ID de parcela '{id_parcela}' ya está registrado. Debe ser único.")
         #Acá estamos validado que el id no se repita, si no se repite se inicializa el objeto y se agrega al diccionario
@@ -32,15 +49,6 @@ class Parcela:
         
         if not cultivo_actual:
             raise ValueError("El cultivo actual no puede estar vacío.")#VAlidación que no esté vacío
-        
-        self.__id_parcela = id_parcela
-        self.__superficie_ha = round(superficie_ha, 2) # Acá se cummple con lo de los 2 decimales
-        self.__cultivo_actual = cultivo_actual
-        self.__estado = "activo" #Por defecto según lo pide el ejericcio
-        self.__historial_eventos = []
-
-        Parcela._parcelas_existentes[id_parcela] = self
-        self.__registrar_evento("Creación", f"Parcela creada con cultivo '{cultivo_actual}' y superficie {superficie_ha} ha.")
 
     """ Getters--------------------------------------------------------------------------------------------------------------- """
     @property
@@ -61,7 +69,7 @@ class Parcela:
     
     @property
     def historialEventos(self):
-        return list(self.__historial_eventos) 
+        return list(self.__historial()) 
     #Si lo escribo así, me devuelve una copia de la lista, no la lista original, por lo que no permitiría que se pueda modificar desde afuera
     
     """ Setters--------------------------------------------------------------------------------------------------------------- """
@@ -71,14 +79,26 @@ class Parcela:
    
     #Acá se realiza un método privado para registrar el historial de los eventos. Se importa datetime para registrar la fecha y hora del evento
 
-    def __registrar_evento(self, tipo: str, detalle: str):
+    def __historial(self):
+        # Si la parcela se restauró de una instantánea, el historial viejo se lee recién acá (la primera vez que se pide)
+        if self.__historial_pendiente is not None:
+            self.__historial_eventos = self.__historial_pendiente() + self.__historial_eventos
+            self.__historial_pendiente = None
+        return self.__historial_eventos
+
+    def __registrar_evento(self, tipo: str, detalle: str, fecha: str = None):
         evento = {
-            "fecha": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "fecha": fecha or datetime.now().strftime("%Y-%m-%d %H:%M:%S"), # Si viene la fecha (registro en lote) se reutiliza
             "tipo": tipo,
             "detalle": detalle
         } #Acá creo el diccionario con los datos
         self.__historial_eventos.append(evento) #Acá le agrego la info al diccionario 
 
+    def __registrar_eventos_lote(self, tipo: str, detalles: list, fecha: str = None):
+        # Varias entradas del mismo tipo con una sola fecha y un solo extend (cargas masivas)
+        fecha = fecha or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.__historial_eventos.extend({"fecha": fecha, "tipo": tipo, "detalle": detalle} for detalle in detalles)
+
     """ Métodos--------------------------------------------------------------------------------------------------------------- """
     def actualizar_cultivo(self, nuevo_cultivo: str):
         if self.__estado == "inactivo":
@@ -95,6 +115,7 @@ class Parcela:
         
         cultivo_previo = self.__cultivo_actual #Guardo el cultivo previo para el registro del evento
         self.__cultivo_actual = nuevo_cultivo #Actualizo el cultivo
+        Parcela._parcelas_existentes.actualizar_indice(self, "cultivo_actual", cultivo_previo, nuevo_cultivo)
         self.__registrar_evento("Actualización de Cultivo", f"Cultivo cambiado de '{cultivo_previo}' a '{nuevo_cultivo}'.")
         
     def activar(self, motivo: str):
@@ -103,6 +124,7 @@ class Parcela:
             return
         
         self.__estado = "activo"   #Cambio el estado a activo
+        Parcela._parcelas_existentes.actualizar_indice(self, "estado", "inactivo", "activo")
         self.__registrar_evento(f"Parcela {self.__id_parcela} activada", motivo)
     
     def desactivar(self, motivo: str):
@@ -111,8 +133,31 @@ class Parcela:
             return
         
         self.__estado = "inactivo"
+        Parcela._parcelas_existentes.actualizar_indice(self, "estado", "activo", "inactivo")
         self.__registrar_evento("Desactivación", motivo)    
 
+    @classmethod
+    def _restaurar(cls, id_parcela: int, superficie_ha: float, cultivo_actual: str, estado: str, cargar_historial=None):
+        # Crea la parcela sin pasar por __init__ (sin eventos de creación ni mensajes); lo usa InstantaneaRiego
+        Parcela._validar_datos(id_parcela, superficie_ha, cultivo_actual)
+        if estado not in Parcela.estados_permitidos:
+            raise ValueError(f"Estado de parcela inválido: '{estado}'.")
+
+        parcela = cls.__new__(cls)
+        parcela.__id_parcela = id_parcela
+        parcela.__superficie_ha = round(superficie_ha, 2) # igual que en __init__
+        parcela.__cultivo_actual = cultivo_actual
+        parcela.__estado = estado
+        parcela.__historial_eventos = []
+        parcela.__historial_pendiente = cargar_historial
+        Parcela._parcelas_existentes.registrar(parcela)
+        return parcela
+
+    @staticmethod
+    def buscar(cultivo: str = None, estado: str = None, estado_riego: str = None) -> list:
+        # Consulta por índices secundarios, ej: Parcela.buscar(cultivo="Maíz", estado="activo")
+        return Parcela._parcelas_existentes.buscar(cultivo, estado, estado_riego)
+
     def rectificar_superficie(self, nueva_superficie: float, motivo: str):
         if nueva_superficie <= 0: #Valido que la superficie sea mayor a 0
             print("La superficie debe ser un número mayor a 0.")
@@ -22,10 +22,22 @@
     # • Saldo nunca puede quedar negativo.
     # • Si la parcela pasa a inactiva, el riego queda automáticamente inhabilitado.
 """--------------------------------------------------------------------------------------------------------------- """
+# Modelo de demanda (opcional)
+    # • usar_modelo_demanda(modelo) → la tasa sale de la tabla cultivo/temporada del modelo y cambia sola con actualizar_cultivo.
+    # • Si el cultivo no está en la tabla se usa la tasa configurada con configurar_tasa.
+# Reservorio compartido (opcional)
+    # • conectar_reservorio(reservorio) → la parcela deja de usar su saldo propio y extrae/carga del tanque compartido.
+    # • umbral_min_litros y "saldo nunca negativo" se aplican sobre el tanque, dentro de su lock.
+"""--------------------------------------------------------------------------------------------------------------- """
 from Clases.Parcela import Parcela
+from Clases.Reservorio import litros_a_aplicar
+from Clases.ResumenRiego import ResumenRiego
 from datetime import datetime
+import threading
 
 class ParcelaConRiego(Parcela):
+
+    _resumen_flota = ResumenRiego() # Totales de todas las parcelas con riego (por día, semana y modo)
     
     def __init__(self, id_parcela: int, superficie_ha: float, cultivo_actual:str):
         super().__init__(id_parcela, superficie_ha, cultivo_actual)
@@ -35,6 +47,12 @@ class ParcelaConRiego(Parcela):
         self.__umbral_min_litros = 0   # Cumple
         self.__estado_riego = "inhabilitado" # Actualmente inhabilitado, se habilita si la parcela se activa
         self.__eventos_riego = []      # solo lectura
+        self.__eventos_pendientes = None # Solo se usa al restaurar desde una instantánea (carga perezosa)
+        self.__resumen = ResumenRiego()  # Se actualiza con cada riego, así las consultas no copian eventos_riego
+        self.__reservorio = None       # Si se conecta a un reservorio compartido, el agua sale de ahí
+        self.__modelo_demanda = None   # Si se asigna un ModeloDemanda, la tasa depende del cultivo
+        self.__lock = threading.Lock() # Lock propio de la parcela (saldo propio y listas de eventos)
+        Parcela._parcelas_existentes.actualizar_indice(self, "estado_riego", None, self.__estado_riego)
 
             # Si la parcela se crea como activa, habilitamos el riego automáticamente
         if self.estado == "activo":
@@ -43,11 +61,35 @@ class ParcelaConRiego(Parcela):
     """ Getters--------------------------------------------------------------------------------------------------------------- """
     @property
     def litrosDisponibles(self):
+        if self.__reservorio is not None:
+            return self.__reservorio.litrosDisponibles
         return self.__litros_disponibles
+
+    @property
+    def reservorio(self):
+        return self.__reservorio
         
     @property
     def tasaRiegoLHa(self):
+        # Tasa efectiva: la del modelo de demanda si tiene el cultivo, si no la configurada a mano
+        if self.__modelo_demanda is not None:
+            tasa = self.__modelo_demanda.tasa(self.cultivoActual)
+            if tasa is not None:
+                return tasa
+        return self.__tasa_riego_l_ha
+
+    @property
+    def tasaConfiguradaLHa(self):
         return self.__tasa_riego_l_ha
+
+    @property
+    def litrosPropios(self):
+        # El saldo propio de la parcela, aunque esté conectada a un reservorio (lo guarda InstantaneaRiego)
+        return self.__litros_disponibles
+
+    @property
+    def modeloDemanda(self):
+        return self.__modelo_demanda
         
     @property
     def umbralMinLitros(self):
@@ -60,8 +102,27 @@ class ParcelaConRiego(Parcela):
     @property
     def eventosRiego(self):
         # Se devuelve una copia para asegurar la inmutabilidad desde fuera
-        return list(self.__eventos_riego)
+        return list(self.__eventos())
     
+    @property
+    def resumenRiego(self):
+        return self.__resumen
+
+    @staticmethod
+    def resumen_flota():
+        return ParcelaConRiego._resumen_flota
+
+    def _eventos_internos(self) -> list:
+        # La lista interna sin copiar, solo para lectura (EscenarioRiego la comparte en vez de copiarla)
+        return self.__eventos()
+
+    def __eventos(self):
+        # Igual que el historial de Parcela: los eventos guardados en la instantánea se leen recién cuando se piden
+        if self.__eventos_pendientes is not None:
+            self.__eventos_riego = self.__eventos_pendientes() + self.__eventos_riego
+            self.__eventos_pendientes = None
+        return self.__eventos_riego
+
     """ Setters--------------------------------------------------------------------------------------------------------------- """
 
     @litrosDisponibles.setter
@@ -74,9 +135,31 @@ class ParcelaConRiego(Parcela):
         super().desactivar(motivo) # Llama al método de la clase base para cambiar el estado y registrar el evento
         if self.__estado_riego == "habilitado":
             self.__estado_riego = "inhabilitado"
+            Parcela._parcelas_existentes.actualizar_indice(self, "estado_riego", "habilitado", "inhabilitado")
             # Usamos el método de la clase base para registrar el evento en el historial principal
             self._Parcela__registrar_evento("Riego Inhabilitado", "La parcela fue desactivada, por lo que el riego se inhabilitó automáticamente.")
 
+    def actualizar_cultivo(self, nuevo_cultivo: str):
+        super().actualizar_cultivo(nuevo_cultivo)
+        if self.__modelo_demanda is not None:
+            self.__modelo_demanda.invalidar(self) # solo se borra la demanda en caché de esta parcela
+
+    def rectificar_superficie(self, nueva_superficie: float, motivo: str):
+        super().rectificar_superficie(nueva_superficie, motivo)
+        if self.__modelo_demanda is not None:
+            self.__modelo_demanda.invalidar(self)
+
+    def usar_modelo_demanda(self, modelo):
+        anterior = self.__modelo_demanda
+        if anterior is not None:
+            anterior.invalidar(self)
+        self.__modelo_demanda = modelo
+        if modelo is None:
+            self._Parcela__registrar_evento("Modelo de demanda", "La parcela vuelve a usar la tasa configurada a mano.")
+            return
+        modelo.invalidar(self)
+        self._Parcela__registrar_evento("Modelo de demanda", f"La tasa se toma del modelo (temporada '{modelo.temporada}'): {self.tasaRiegoLHa} L/ha.")
+
     def configurar_tasa(self, l_ha: float): #cantidad de litros por hectárea
         if l_ha <= 0:
             print(" La tasa de riego debe ser un número mayor a 0")
@@ -84,6 +167,8 @@ class ParcelaConRiego(Parcela):
         
         anterior = self.__tasa_riego_l_ha #Guardo el valor previo para el registro del evento
         self.__tasa_riego_l_ha = l_ha #Actualizo la tasa
+        if self.__modelo_demanda is not None:
+            self.__modelo_demanda.invalidar(self) # si el cultivo no está en el modelo, la demanda en caché usaba la tasa vieja
         self._Parcela__registrar_evento("COnfiguración tasa de riego",f"Tasa de riego configurada de {anterior} L/ha a {l_ha} L/ha.")
         print(f"La tasa de riego ha sido configurada a: {self.__tasa_riego_l_ha} L/ha.")
 
@@ -108,6 +193,7 @@ class ParcelaConRiego(Parcela):
             return
 
         self.__estado_riego = "habilitado" #Cambio el estado a habilitado
+        Parcela._parcelas_existentes.actualizar_indice(self, "estado_riego", "inhabilitado", "habilitado")
         self._Parcela__registrar_evento("Riego Habilitado", "Sistema de riego puesto en 'habilitado'.")
         print("Se ha habilitado el riego de la parcela")
 
@@ -117,37 +203,179 @@ class ParcelaConRiego(Parcela):
             return
 
         self.__estado_riego = "inhabilitado"
+        Parcela._parcelas_existentes.actualizar_indice(self, "estado_riego", "habilitado", "inhabilitado")
         self._Parcela__registrar_evento("Riego Inhabilitado", "Sistema de riego puesto en 'inhabilitado'.")
         print("Se ha inhabilitado el riego de la parcela")
 
     #-----Acá termina los cambios de habilitar/deshabiliar riego y empieza lo de cargar agua y regar automático----------------------------------------------------------------
     
+    @classmethod
+    def _restaurar(cls, id_parcela: int, superficie_ha: float, cultivo_actual: str, estado: str, cargar_historial=None,
+                   litros_disponibles: float = 0, tasa_riego_l_ha: float = 0, umbral_min_litros: float = 0,
+                   estado_riego: str = "inhabilitado", cargar_eventos=None, resumen: dict = None):
+        if litros_disponibles < 0 or umbral_min_litros < 0 or tasa_riego_l_ha < 0:
+            raise ValueError("Los datos de riego restaurados no pueden ser negativos.")
+        if estado_riego not in ("habilitado", "inhabilitado"):
+            raise ValueError(f"Estado de riego inválido: '{estado_riego}'.")
+
+        parcela = super()._restaurar(id_parcela, superficie_ha, cultivo_actual, estado, cargar_historial)
+        parcela.__litros_disponibles = litros_disponibles
+        parcela.__tasa_riego_l_ha = tasa_riego_l_ha
+        parcela.__umbral_min_litros = umbral_min_litros
+        parcela.__estado_riego = estado_riego
+        parcela.__eventos_riego = []
+        parcela.__eventos_pendientes = cargar_eventos
+        parcela.__resumen = ResumenRiego()
+        parcela.__modelo_demanda = None
+        parcela.__reservorio = None # La conexión a un reservorio compartido no se guarda en la instantánea
+        parcela.__lock = threading.Lock()
+        if resumen:
+            parcela.__resumen.fusionar(resumen)
+            ParcelaConRiego._resumen_flota.fusionar(resumen)
+        Parcela._parcelas_existentes.actualizar_indice(parcela, "estado_riego", None, estado_riego)
+        return parcela
+
+    def conectar_reservorio(self, reservorio):
+        if self.__reservorio is reservorio:
+            print(f"La parcela ya está conectada al reservorio {reservorio.idReservorio}.")
+            return
+
+        self.__reservorio = reservorio
+        self._Parcela__registrar_evento("Reservorio conectado", f"La parcela usa el reservorio compartido {reservorio.idReservorio}.")
+
+    def desconectar_reservorio(self):
+        if self.__reservorio is None:
+            print("La parcela no está conectada a ningún reservorio.")
+            return
+
+        anterior = self.__reservorio
+        self.__reservorio = None
+        self._Parcela__registrar_evento("Reservorio desconectado", f"La parcela dejó de usar el reservorio {anterior.idReservorio}.")
+
     def cargar_agua(self, litros: float):
         if litros <= 0:
             print("La cantidad a cargar debe ser mayor a 0 litros.")
             return
-            
-        saldo_antes = self.__litros_disponibles #Guardo el saldo antes de la carga
-        self.__litros_disponibles += litros #Actualizo el saldo
-        saldo_despues = self.__litros_disponibles #Guardo el saldo después de la carga
+
+        if self.__reservorio is not None:
+            saldo_antes, saldo_despues = self.__reservorio.cargar(litros) #La suma se hace dentro del lock del reservorio
+        else:
+            with self.__lock:
+                saldo_antes = self.__litros_disponibles #Guardo el saldo antes de la carga
+                self.__litros_disponibles += litros #Actualizo el saldo
+                saldo_despues = self.__litros_disponibles #Guardo el saldo después de la carga
         
         detalle_evento = f"Se ha cargado agua: Litros: {litros} L, Saldo Antes: {saldo_antes:.2f} L, Saldo Después: {saldo_despues:.2f} L."
-        self._Parcela__registrar_evento("Carga de Agua", detalle_evento)
-        print(f"Se ha cargado {litros:.2f} L de agua, su nuevo saldo es de: {self.__litros_disponibles:.2f} L.")
+        with self.__lock:
+            self._Parcela__registrar_evento("Carga de Agua", detalle_evento)
+        print(f"Se ha cargado {litros:.2f} L de agua, su nuevo saldo es de: {saldo_despues:.2f} L.")
+
+    def _cargar_agua_lote(self, cargas: list, fecha: str = None):
+        # Igual que cargar_agua pero para muchas cargas seguidas: se suma una sola vez y el historial se escribe en un bloque
+        if any(litros <= 0 for litros in cargas):
+            raise ValueError("La cantidad a cargar debe ser mayor a 0 litros.")
+        if not cargas:
+            return 0
+
+        total = sum(cargas)
+        if self.__reservorio is not None:
+            saldo_antes, _ = self.__reservorio.cargar(total)
+        else:
+            with self.__lock:
+                saldo_antes = self.__litros_disponibles
+                self.__litros_disponibles += total
+
+        detalles = []
+        saldo = saldo_antes
+        for litros in cargas: # Los saldos intermedios son los mismos que si se hubiera llamado cargar_agua una por una
+            detalles.append(f"Se ha cargado agua: Litros: {litros} L, Saldo Antes: {saldo:.2f} L, Saldo Después: {saldo + litros:.2f} L.")
+            saldo += litros
+        with self.__lock:
+            self._Parcela__registrar_eventos_lote("Carga de Agua", detalles, fecha)
+        return total
 
-    def __registrar_evento_riego(self, litros_solicitados: float, litros_aplicados: float, saldo_antes: float, modo: str):
+    def __registrar_evento_riego(self, litros_solicitados: float, litros_aplicados: float, saldo_antes: float, saldo_despues: float, modo: str, fecha: str = None):
+        if fecha is None:
+            fecha = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         evento = {
-            "fecha": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "fecha": fecha,
             "litros_solicitados": litros_solicitados,
             "litros_aplicados": litros_aplicados,
             "saldo_antes": saldo_antes,
-            "saldo_despues": self.__litros_disponibles,
+            "saldo_despues": saldo_despues,
             "modo": modo
         }
-        self.__eventos_riego.append(evento)
-        
-        # Registrar también en el historial general de la parcela
-        self._Parcela__registrar_evento(f"Riego ({modo})", f"Aplicados {litros_aplicados:.2f} L. Saldo final: {self.__litros_disponibles:.2f} L.")
+        with self.__lock:
+            self.__eventos_riego.append(evento) # Si hay eventos pendientes de la instantánea, se unen adelante al leerlos
+            # Registrar también en el historial general de la parcela
+            self._Parcela__registrar_evento(f"Riego ({modo})", f"Aplicados {litros_aplicados:.2f} L. Saldo final: {saldo_despues:.2f} L.", fecha)
+            self.__resumen.registrar_riego(fecha, litros_aplicados, modo)
+        ParcelaConRiego._resumen_flota.registrar_riego(fecha, litros_aplicados, modo)
+
+    def _registrar_rechazo_riego(self, modo: str, fecha: str = None):
+        # El rechazo no va a eventos_riego (solo se registran riegos con agua aplicada), pero sí cuenta en los resúmenes
+        fecha = fecha or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self.__lock:
+            self.__resumen.registrar_rechazo(fecha, modo)
+        ParcelaConRiego._resumen_flota.registrar_rechazo(fecha, modo)
+
+    def _aplicar_riego_calculado(self, litros_solicitados: float, litros_aplicados: float, modo: str, fecha: str = None):
+        # Lo usa AsignacionAgua: el cálculo ya se hizo (y validó) afuera, acá solo se descuenta y se registra sin imprimir.
+        # Si el saldo bajó desde la validación (otro hilo) se aplica lo que queda sobre el umbral ("parcial"), sin error.
+        if litros_aplicados <= 0 or not self._riego_permitido():
+            return 0
+        umbral = self.umbralMinLitros
+        if self.__reservorio is not None:
+            saldo_antes, litros_aplicados, saldo_despues = self.__reservorio.extraer(litros_aplicados, umbral, "parcial")
+        else:
+            with self.__lock:
+                saldo_antes = self.__litros_disponibles
+                litros_aplicados = litros_a_aplicar(saldo_antes, litros_aplicados, umbral, "parcial")
+                self.__litros_disponibles -= litros_aplicados
+                saldo_despues = self.__litros_disponibles
+        if litros_aplicados > 0:
+            self.__registrar_evento_riego(litros_solicitados, litros_aplicados, saldo_antes, saldo_despues, modo, fecha)
+        return litros_aplicados
+
+    def _regar_calculado(self, litros_solicitados: float, umbral: float, litros_aplicados: float, saldo_esperado: float,
+                         modo: str, fecha: str, contar_en_flota: bool = True):
+        # Lo usa el motor en lote (FlotaRiego): litros_aplicados se calculó afuera con saldo_esperado.
+        # Si el saldo de la parcela cambió desde entonces (carga o riego por fuera del motor) se recalcula acá, dentro
+        # del lock, con el saldo real: nunca queda negativo ni se aplica con un saldo viejo.
+        # Devuelve (litros aplicados, saldo después), o None si la parcela ya no puede regar.
+        if self.__reservorio is not None:
+            raise ValueError("Una parcela conectada a un reservorio compartido no se puede regar con un cálculo externo.")
+        if not self._riego_permitido():
+            return None
+        with self.__lock:
+            saldo_antes = self.__litros_disponibles
+            if saldo_antes != saldo_esperado:
+                litros_aplicados = litros_a_aplicar(saldo_antes, litros_solicitados, umbral, modo)
+            self.__litros_disponibles = saldo_antes - litros_aplicados
+            saldo_despues = self.__litros_disponibles
+            if litros_aplicados > 0:
+                self.__eventos_riego.append({
+                    "fecha": fecha,
+                    "litros_solicitados": litros_solicitados,
+                    "litros_aplicados": litros_aplicados,
+                    "saldo_antes": saldo_antes,
+                    "saldo_despues": saldo_despues,
+                    "modo": modo
+                })
+                self._Parcela__registrar_evento(f"Riego ({modo})", f"Aplicados {litros_aplicados:.2f} L. Saldo final: {saldo_despues:.2f} L.", fecha)
+                self.__resumen.registrar_riego(fecha, litros_aplicados, modo)
+            else:
+                self.__resumen.registrar_rechazo(fecha, modo)
+        if contar_en_flota:
+            if litros_aplicados > 0:
+                ParcelaConRiego._resumen_flota.registrar_riego(fecha, litros_aplicados, modo)
+            else:
+                ParcelaConRiego._resumen_flota.registrar_rechazo(fecha, modo)
+        return litros_aplicados, saldo_despues
+
+    def _riego_permitido(self) -> bool:
+        # Igual que __es_riego_permitido pero sin mensajes, para consultas en lote
+        return self.estado == "activo" and self.__estado_riego == "habilitado" and self.tasaRiegoLHa > 0
 
     def __es_riego_permitido(self):
         if self.estado != "activo":
@@ -156,7 +384,7 @@ class ParcelaConRiego(Parcela):
         if self.__estado_riego == "inhabilitado":
             print("Riego rechazado: El riego está inhabilitado.")
             return False
-        if self.__tasa_riego_l_ha <= 0:
+        if self.tasaRiegoLHa <= 0:
             print("Riego rechazado: La tasa de riego es 0 o menor. Configúrala primero.")
             return False
         return True
@@ -169,45 +397,45 @@ class ParcelaConRiego(Parcela):
             print("Modo de riego inválido. Use 'estricto' o 'parcial'.")
             return 0
     
-        demanda = self.superficieHa * self.tasaRiegoLHa
-        litros_aplicados = 0
-        saldo_antes = self.__litros_disponibles
+        if self.__modelo_demanda is not None:
+            demanda = self.__modelo_demanda.demanda(self) # queda en caché hasta que cambie el cultivo, la superficie o la tabla
+        else:
+            demanda = self.superficieHa * self.tasaRiegoLHa
+        umbral = self.umbralMinLitros
+
+        # La cuenta y el descuento se hacen juntos (atómicos): en el reservorio con su lock, o con el lock de la parcela
+        if self.__reservorio is not None:
+            saldo_antes, litros_aplicados, saldo_despues = self.__reservorio.extraer(demanda, umbral, modo)
+        else:
+            with self.__lock:
+                saldo_antes = self.__litros_disponibles
+                litros_aplicados = litros_a_aplicar(saldo_antes, demanda, umbral, modo)
+                self.__litros_disponibles -= litros_aplicados
+                saldo_despues = self.__litros_disponibles
         
-        print(f"Iniciando riego '{modo}' (Demanda: {demanda:.2f} L, Saldo: {saldo_antes:.2f} L, Umbral: {self.umbralMinLitros} L)")
+        print(f"Iniciando riego '{modo}' (Demanda: {demanda:.2f} L, Saldo: {saldo_antes:.2f} L, Umbral: {umbral} L)")
         
         if modo == "estricto":
             # Condición: aplica solo si litros_disponibles - demanda >= umbral_min_litros
-            saldo_final_esperado = saldo_antes - demanda
-            
-            if saldo_final_esperado >= self.umbralMinLitros:
-                litros_aplicados = demanda
-                self.__litros_disponibles -= litros_aplicados
+            if litros_aplicados > 0:
                 print(f"Riego Estricto APLICADO. Aplicados {litros_aplicados:.2f} L.")
             else:
-                print(f"Riego Estricto RECHAZADO. Saldo final ({saldo_final_esperado:.2f} L) sería inferior al umbral ({self.umbralMinLitros} L).")
+                print(f"Riego Estricto RECHAZADO. Saldo final ({saldo_antes - demanda:.2f} L) sería inferior al umbral ({umbral} L).")
                 
         elif modo == "parcial":
             # Aplica la mayor cantidad posible manteniendo saldo_final >= umbral_min_litros.
-            
-            maximo_aplicable = saldo_antes - self.umbralMinLitros
-            
-            if maximo_aplicable <= 0:
-                print(f"Riego Parcial RECHAZADO. Saldo disponible ({saldo_antes:.2f} L) es insuficiente para dejar el umbral ({self.umbralMinLitros} L).")
-                
-            elif maximo_aplicable < demanda:
-                # Aplica un riego parcial, dejando el saldo justo en el umbral
-                litros_aplicados = maximo_aplicable
-                self.__litros_disponibles -= litros_aplicados
+            if litros_aplicados <= 0:
+                print(f"Riego Parcial RECHAZADO. Saldo disponible ({saldo_antes:.2f} L) es insuficiente para dejar el umbral ({umbral} L).")
+            elif litros_aplicados < demanda:
+                # Se aplicó un riego parcial, dejando el saldo justo en el umbral
                 print(f"Riego Parcial APLICADO parcialmente. Aplicados {litros_aplicados:.2f} L.")
-                
-            else: # maximo_aplicable >= demanda
-                # Aplica la demanda completa
-                litros_aplicados = demanda
-                self.__litros_disponibles -= litros_aplicados
+            else:
                 print(f"Riego Parcial APLICADO en su totalidad. Aplicados {litros_aplicados:.2f} L.")
 
         # Registrar el evento si se aplicó agua
         if litros_aplicados > 0:
-            self.__registrar_evento_riego(demanda, litros_aplicados, saldo_antes, modo)
+            self.__registrar_evento_riego(demanda, litros_aplicados, saldo_antes, saldo_despues, modo)
+        else:
+            self._registrar_rechazo_riego(modo)
         
         return litros_aplicados
\ No newline at end of file
@@ -0,0 +1,154 @@
+# Programador de riego con asyncio (un solo proceso, sin un hilo por parcela).
+# Datos
+    # • cola de prioridad (heap) con el próximo riego de cada parcela: (momento, secuencia, id_parcela).
+    # • configuración por parcela: cada cuántos segundos se riega y en qué modo.
+# Operaciones
+    # • programar(parcela, cada_segundos, modo) / cancelar(parcela).
+    # • ejecutar(duracion) → corrutina que dispara regar_automatico cuando a cada parcela le toca.
+    # • detener() → termina el ciclo de ejecutar.
+# Reglas de negocio
+    # • Los riegos que vencen dentro de la misma ventana (ventana_lote) se ejecutan juntos en un lote.
+    # • Contrapresión: si al tanque (reservorio compartido o saldo propio) le queda poco sobre el umbral, el riego se posterga.
+    # • Cada parcela mantiene su cadencia; si el programador viene atrasado no se acumulan riegos pendientes.
+"""--------------------------------------------------------------------------------------------------------------- """
+import asyncio
+import heapq
+import itertools
+
+
+class ProgramadorRiego:
+
+    def __init__(self, ventana_lote: float = 0.5, margen_minimo_litros: float = 0, espera_por_contrapresion: float = 5.0):
+        if ventana_lote < 0 or espera_por_contrapresion <= 0:
+            raise ValueError("La ventana de lote debe ser ≥ 0 y la espera por contrapresión > 0.")
+
+        self.__ventana_lote = ventana_lote
+        self.__margen_minimo = margen_minimo_litros
+        self.__espera_contrapresion = espera_por_contrapresion
+        self.__cola = []                    # heap de (momento, secuencia, id_parcela)
+        self.__programadas = {}             # id_parcela → (parcela, cada_segundos, modo, secuencia)
+        self.__secuencia = itertools.count() # desempata el heap y sirve para descartar entradas viejas
+        self.__despertar = None
+        self.__detenido = False
+        self.__riegos_ejecutados = 0
+        self.__riegos_postergados = 0
+        self.__lotes = 0
+
+    """ Getters--------------------------------------------------------------------------------------------------------------- """
+    @property
+    def riegosEjecutados(self):
+        return self.__riegos_ejecutados
+
+    @property
+    def riegosPostergados(self):
+        return self.__riegos_postergados
+
+    @property
+    def lotesEjecutados(self):
+        return self.__lotes
+
+    @property
+    def cantidadProgramadas(self):
+        return len(self.__programadas)
+
+    """ Métodos--------------------------------------------------------------------------------------------------------------- """
+    def __ahora(self):
+        return asyncio.get_running_loop().time() if self.__despertar is not None else 0.0
+
+    def __encolar(self, id_parcela, momento: float):
+        parcela, cada_segundos, modo, _ = self.__programadas[id_parcela]
+        secuencia = next(self.__secuencia)
+        self.__programadas[id_parcela] = (parcela, cada_segundos, modo, secuencia)
+        heapq.heappush(self.__cola, (momento, secuencia, id_parcela))
+
+    def programar(self, parcela, cada_segundos: float, modo: str = "estricto", primer_riego_en: float = 0):
+        if cada_segundos <= 0:
+            raise ValueError("La cadencia de riego debe ser mayor a 0 segundos.")
+        if modo not in ["estricto", "parcial"]:
+            raise ValueError("Modo de riego inválido. Use 'estricto' o 'parcial'.")
+
+        # Si la parcela ya estaba programada, la entrada anterior del heap queda vieja y se descarta al salir
+        self.__programadas[parcela.idParcela] = (parcela, cada_segundos, modo, None)
+        self.__encolar(parcela.idParcela, self.__ahora() + primer_riego_en)
+        if self.__despertar is not None:
+            self.__despertar.set() # Puede que este riego venza antes que el que se estaba esperando
+
+    def cancelar(self, parcela):
+        if self.__programadas.pop(parcela.idParcela, None) is None:
+            print(f"La parcela {parcela.idParcela} no tenía riegos programados.")
+
+    def detener(self):
+        self.__detenido = True
+        if self.__despertar is not None:
+            self.__despertar.set()
+
+    def __hay_contrapresion(self, parcela) -> bool:
+        # litrosDisponibles ya devuelve el saldo del reservorio compartido si la parcela está conectada a uno
+        return parcela.litrosDisponibles - parcela.umbralMinLitros <= self.__margen_minimo
+
+    def __sacar_lote(self, limite: float) -> list:
+        lote = []
+        while self.__cola and self.__cola[0][0] <= limite:
+            momento, secuencia, id_parcela = heapq.heappop(self.__cola)
+            programada = self.__programadas.get(id_parcela)
+            if programada is None or programada[3] != secuencia:
+                continue # entrada vieja (cancelada o reprogramada)
+            lote.append((momento, id_parcela))
+        return lote
+
+    def __ejecutar_lote(self, lote: list, ahora: float):
+        for momento, id_parcela in lote:
+            parcela, cada_segundos, modo, _ = self.__programadas[id_parcela]
+            if self.__hay_contrapresion(parcela):
+                self.__riegos_postergados += 1
+                self.__encolar(id_parcela, ahora + self.__espera_contrapresion)
+                continue
+
+            parcela.regar_automatico(modo)
+            self.__riegos_ejecutados += 1
+            # Se mantiene la cadencia, pero si venimos atrasados no se encadenan riegos vencidos
+            self.__encolar(id_parcela, max(momento + cada_segundos, ahora))
+        self.__lotes += 1
+
+    async def ejecutar(self, duracion: float = None):
+        loop = asyncio.get_running_loop()
+        self.__despertar = asyncio.Event()
+        self.__detenido = False
+        fin = None if duracion is None else loop.time() + duracion
+
+        # Las parcelas programadas antes de arrancar quedaron con tiempo relativo 0, se corren al reloj del loop
+        inicio = loop.time()
+        self.__cola = [(inicio + momento, secuencia, id_parcela) for momento, secuencia, id_parcela in self.__cola]
+        heapq.heapify(self.__cola)
+
+        try:
+            while not self.__detenido:
+                ahora = loop.time()
+                if fin is not None and ahora >= fin:
+                    break
+
+                if self.__cola:
+                    espera = self.__cola[0][0] - ahora
+                else:
+                    espera = None
+                if fin is not None:
+                    espera = fin - ahora if espera is None else min(espera, fin - ahora)
+
+                if espera is None or espera > 0:
+                    self.__despertar.clear()
+                    try:
+                        await asyncio.wait_for(self.__despertar.wait(), espera)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                lote = self.__sacar_lote(ahora + self.__ventana_lote)
+                if lote:
+                    self.__ejecutar_lote(lote, ahora)
+                await asyncio.sleep(0) # Se cede el control al loop entre lotes
+        finally:
+            # Se vuelven a dejar los tiempos relativos por si se vuelve a ejecutar más adelante
+            ahora = loop.time()
+            self.__cola = [(momento - ahora, secuencia, id_parcela) for momento, secuencia, id_parcela in self.__cola]
+            heapq.heapify(self.__cola)
+            self.__despertar = None
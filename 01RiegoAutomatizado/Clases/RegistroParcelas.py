@@ -0,0 +1,78 @@
+# Registro de parcelas con índices secundarios.
+# Datos
+    # • parcelas por id (igual que el diccionario que tenía Parcela._parcelas_existentes).
+    # • índices secundarios: cultivo_actual, estado y estado_riego → conjunto de ids.
+# Operaciones
+    # • registrar(parcela) → agrega la parcela; el id debe ser único.
+    # • actualizar_indice(parcela, campo, anterior, nuevo) → mueve el id de un valor a otro del índice.
+    # • buscar(cultivo=..., estado=..., estado_riego=...) → devuelve las parcelas que cumplen todo.
+# Reglas de negocio
+    # • Los índices se actualizan desde las operaciones de la parcela (actualizar_cultivo, activar/desactivar, habilitar/inhabilitar riego).
+    # • El cultivo se indexa sin distinguir mayúsculas, igual que la comparación de actualizar_cultivo.
+"""--------------------------------------------------------------------------------------------------------------- """
+
+CAMPOS_INDEXADOS = ("cultivo_actual", "estado", "estado_riego")
+
+
+class RegistroParcelas:
+
+    def __init__(self):
+        self.__parcelas = {} # id → parcela
+        self.__indices = {campo: {} for campo in CAMPOS_INDEXADOS} # campo → valor → set de ids
+
+    """ Métodos para que se comporte como el diccionario anterior----------------------------------------------------------------- """
+    def __contains__(self, id_parcela):
+        return id_parcela in self.__parcelas
+
+    def __getitem__(self, id_parcela):
+        return self.__parcelas[id_parcela]
+
+    def __len__(self):
+        return len(self.__parcelas)
+
+    def __iter__(self):
+        return iter(self.__parcelas)
+
+    def get(self, id_parcela, defecto=None):
+        return self.__parcelas.get(id_parcela, defecto)
+
+    """ Métodos--------------------------------------------------------------------------------------------------------------- """
+    @staticmethod
+    def __clave(campo: str, valor):
+        if campo == "cultivo_actual" and isinstance(valor, str):
+            return valor.strip().lower()
+        return valor
+
+    def registrar(self, parcela):
+        if parcela.idParcela in self.__parcelas:
+            raise ValueError(f"El ID de parcela '{parcela.idParcela}' ya está registrado. Debe ser único.")
+        self.__parcelas[parcela.idParcela] = parcela
+        self.actualizar_indice(parcela, "cultivo_actual", None, parcela.cultivoActual)
+        self.actualizar_indice(parcela, "estado", None, parcela.estado)
+
+    def actualizar_indice(self, parcela, campo: str, anterior, nuevo):
+        indice = self.__indices[campo]
+        if anterior is not None:
+            ids = indice.get(self.__clave(campo, anterior))
+            if ids is not None:
+                ids.discard(parcela.idParcela)
+                if not ids:
+                    del indice[self.__clave(campo, anterior)] #No dejamos conjuntos vacíos en el índice
+        if nuevo is not None:
+            indice.setdefault(self.__clave(campo, nuevo), set()).add(parcela.idParcela)
+
+    def ids_por(self, campo: str, valor) -> set:
+        # Devuelve el conjunto del índice (solo lectura, por eso una copia chica del resultado)
+        return set(self.__indices[campo].get(self.__clave(campo, valor), ()))
+
+    def buscar(self, cultivo: str = None, estado: str = None, estado_riego: str = None) -> list:
+        filtros = [(c, v) for c, v in (("cultivo_actual", cultivo), ("estado", estado), ("estado_riego", estado_riego)) if v is not None]
+        if not filtros:
+            return list(self.__parcelas.values())
+
+        conjuntos = [self.__indices[c].get(self.__clave(c, v), set()) for c, v in filtros]
+        conjuntos.sort(key=len) # Se parte del conjunto más chico para que la intersección cueste O(resultado)
+        ids = conjuntos[0]
+        for otro in conjuntos[1:]:
+            ids = ids & otro
+        return [self.__parcelas[i] for i in ids]
@@ -0,0 +1,69 @@
+# Reservorio (tanque) compartido por varias parcelas con riego.
+# Datos
+    # • id_reservorio.
+    # • litros_disponibles (≥ 0; no editable directamente).
+# Operaciones
+    # • cargar(litros) → suma si litros > 0.
+    # • extraer(demanda, umbral, modo) → descuenta según las reglas de regar_automatico (estricto/parcial).
+# Reglas de negocio
+    # • Cada reservorio tiene su propio lock, así parcelas de distintos tanques no se bloquean entre sí.
+    # • Dentro del lock solo se hace la cuenta; mensajes e historial se hacen afuera para que la sección crítica sea corta.
+    # • El saldo nunca queda negativo ni por debajo del umbral de la parcela que extrae, aunque haya muchos hilos.
+"""--------------------------------------------------------------------------------------------------------------- """
+import threading
+
+
+def litros_a_aplicar(saldo: float, demanda: float, umbral: float, modo: str) -> float:
+    # Misma lógica que regar_automatico, separada para poder usarla con o sin reservorio
+    if modo == "estricto":
+        return demanda if saldo - demanda >= umbral else 0
+
+    maximo_aplicable = saldo - umbral
+    if maximo_aplicable <= 0:
+        return 0
+    return min(maximo_aplicable, demanda)
+
+
+class Reservorio:
+
+    def __init__(self, id_reservorio, litros_iniciales: float = 0):
+        if litros_iniciales < 0:
+            raise ValueError("Los litros iniciales del reservorio deben ser mayores o iguales a 0.")
+
+        self.__id_reservorio = id_reservorio
+        self.__litros_disponibles = litros_iniciales
+        self.__lock = threading.Lock()
+
+    """ Getters--------------------------------------------------------------------------------------------------------------- """
+    @property
+    def idReservorio(self):
+        return self.__id_reservorio
+
+    @property
+    def litrosDisponibles(self):
+        return self.__litros_disponibles
+
+    @litrosDisponibles.setter
+    def litrosDisponibles(self, value):
+        raise Exception("No puedes modificar la cantidad de agua del reservorio directamente. Usa cargar() o extraer().")
+
+    """ Métodos--------------------------------------------------------------------------------------------------------------- """
+    def cargar(self, litros: float):
+        if litros <= 0:
+            raise ValueError("La cantidad a cargar debe ser mayor a 0 litros.")
+
+        with self.__lock:
+            saldo_antes = self.__litros_disponibles
+            self.__litros_disponibles += litros
+            return saldo_antes, self.__litros_disponibles
+
+    def extraer(self, demanda: float, umbral: float, modo: str):
+        # Devuelve (saldo_antes, litros_aplicados, saldo_despues) leídos dentro del mismo lock
+        with self.__lock:
+            saldo_antes = self.__litros_disponibles
+            aplicados = litros_a_aplicar(saldo_antes, demanda, umbral, modo)
+            self.__litros_disponibles -= aplicados
+            return saldo_antes, aplicados, self.__litros_disponibles
+
+    def __str__(self):
+        return f"Reservorio {self.__id_reservorio} ({self.__litros_disponibles:.2f} L)"
@@ -0,0 +1,137 @@
+# Resumen incremental de riegos por día y por semana (para tableros), sin recorrer eventos_riego.
+# Datos
+    # • litros aplicados por día ("AAAA-MM-DD") y por semana ISO ("AAAA-Wss").
+    # • cantidad de riegos y de rechazos por día y por modo.
+# Operaciones
+    # • registrar_riego(fecha, litros, modo) / registrar_rechazo(fecha, modo) → los llama ParcelaConRiego al regar.
+    # • validar_diccionario(datos) → revisa la forma de a_diccionario() sin sumar nada (lo usa InstantaneaRiego).
+    # • registrar_lote(fecha, litros, modo, riegos, rechazos) → totales de un ciclo entero de FlotaRiego.
+    # • litros_por_dia(desde, hasta), litros_por_semana(), riegos_por_modo(...), rechazos_por_modo(...).
+# Reglas de negocio
+    # • La fecha llega con el mismo formato que en los eventos ("%Y-%m-%d %H:%M:%S"): el día sale de cortar el texto,
+    #   y la semana se calcula una sola vez por día distinto.
+    # • Las consultas recorren solo los períodos (días/semanas), nunca la lista de eventos.
+    # • Un rechazo es un riego que se intentó en un modo válido y no aplicó agua por falta de saldo sobre el umbral.
+    # • Cada resumen tiene su propio lock: el de la flota se actualiza desde varias parcelas (e hilos) a la vez.
+"""--------------------------------------------------------------------------------------------------------------- """
+from datetime import date
+import threading
+
+
+class ResumenRiego:
+
+    __semanas_por_dia = {} # cache compartido "AAAA-MM-DD" → "AAAA-Wss"
+
+    def __init__(self):
+        self.__litros_por_dia = {}
+        self.__litros_por_semana = {}
+        self.__riegos_por_dia = {}    # día → {modo: cantidad}
+        self.__rechazos_por_dia = {}  # día → {modo: cantidad}
+        self.__lock = threading.Lock()
+
+    """ Métodos--------------------------------------------------------------------------------------------------------------- """
+    @classmethod
+    def __semana(cls, dia: str) -> str:
+        semana = cls.__semanas_por_dia.get(dia)
+        if semana is None:
+            anio, numero, _ = date.fromisoformat(dia).isocalendar()
+            semana = f"{anio}-W{numero:02d}"
+            cls.__semanas_por_dia[dia] = semana
+        return semana
+
+    def registrar_riego(self, fecha: str, litros: float, modo: str):
+        dia = fecha[:10]
+        semana = self.__semana(dia)
+        with self.__lock:
+            self.__litros_por_dia[dia] = self.__litros_por_dia.get(dia, 0) + litros
+            self.__litros_por_semana[semana] = self.__litros_por_semana.get(semana, 0) + litros
+            por_modo = self.__riegos_por_dia.setdefault(dia, {})
+            por_modo[modo] = por_modo.get(modo, 0) + 1
+
+    def registrar_lote(self, fecha: str, litros: float, modo: str, riegos: int, rechazos: int = 0):
+        # Un ciclo entero de un motor en lote (misma fecha y modo) con una sola actualización
+        dia = fecha[:10]
+        semana = self.__semana(dia)
+        with self.__lock:
+            if riegos:
+                self.__litros_por_dia[dia] = self.__litros_por_dia.get(dia, 0) + litros
+                self.__litros_por_semana[semana] = self.__litros_por_semana.get(semana, 0) + litros
+                por_modo = self.__riegos_por_dia.setdefault(dia, {})
+                por_modo[modo] = por_modo.get(modo, 0) + riegos
+            if rechazos:
+                por_modo = self.__rechazos_por_dia.setdefault(dia, {})
+                por_modo[modo] = por_modo.get(modo, 0) + rechazos
+
+    def registrar_rechazo(self, fecha: str, modo: str):
+        with self.__lock:
+            por_modo = self.__rechazos_por_dia.setdefault(fecha[:10], {})
+            por_modo[modo] = por_modo.get(modo, 0) + 1
+
+    @staticmethod
+    def __filtrar(por_periodo: dict, desde: str = None, hasta: str = None) -> dict:
+        # desde/hasta son claves del mismo formato ("AAAA-MM-DD" o "AAAA-Wss"), inclusivas
+        return {periodo: valor for periodo, valor in sorted(por_periodo.items())
+                if (desde is None or periodo >= desde) and (hasta is None or periodo <= hasta)}
+
+    def litros_por_dia(self, desde: str = None, hasta: str = None) -> dict:
+        with self.__lock:
+            return self.__filtrar(self.__litros_por_dia, desde, hasta)
+
+    def litros_por_semana(self, desde: str = None, hasta: str = None) -> dict:
+        with self.__lock:
+            return self.__filtrar(self.__litros_por_semana, desde, hasta)
+
+    def __sumar_por_modo(self, por_dia: dict, desde: str = None, hasta: str = None) -> dict:
+        totales = {}
+        with self.__lock:
+            for por_modo in self.__filtrar(por_dia, desde, hasta).values():
+                for modo, cantidad in por_modo.items():
+                    totales[modo] = totales.get(modo, 0) + cantidad
+        return totales
+
+    def riegos_por_modo(self, desde: str = None, hasta: str = None) -> dict:
+        return self.__sumar_por_modo(self.__riegos_por_dia, desde, hasta)
+
+    def rechazos_por_modo(self, desde: str = None, hasta: str = None) -> dict:
+        return self.__sumar_por_modo(self.__rechazos_por_dia, desde, hasta)
+
+    def a_diccionario(self) -> dict:
+        # Forma serializable (JSON), la usa InstantaneaRiego
+        with self.__lock:
+            return {
+                "litros_por_dia": dict(self.__litros_por_dia),
+                "riegos_por_dia": {dia: dict(m) for dia, m in self.__riegos_por_dia.items()},
+                "rechazos_por_dia": {dia: dict(m) for dia, m in self.__rechazos_por_dia.items()},
+            }
+
+    @staticmethod
+    def validar_diccionario(datos) -> dict:
+        # ValueError si datos no tiene la forma de a_diccionario(); así fusionar() nunca falla a mitad de camino
+        if not isinstance(datos, dict):
+            raise ValueError("El resumen de riego debe ser un diccionario.")
+        for campo, valor in datos.items():
+            if campo not in ("litros_por_dia", "riegos_por_dia", "rechazos_por_dia") or not isinstance(valor, dict):
+                raise ValueError(f"Campo inválido en el resumen de riego: '{campo}'.")
+            for dia, cantidad in valor.items():
+                try:
+                    date.fromisoformat(dia)
+                except (TypeError, ValueError):
+                    raise ValueError(f"Día inválido en el resumen de riego: '{dia}'.") from None
+                por_modo = {"": cantidad} if campo == "litros_por_dia" else cantidad
+                if not isinstance(por_modo, dict) or any(isinstance(n, bool) or not isinstance(n, (int, float)) for n in por_modo.values()):
+                    raise ValueError(f"Valor inválido en el resumen de riego ('{campo}', '{dia}').")
+        return datos
+
+    def fusionar(self, datos: dict):
+        # Suma otro resumen (en forma de diccionario) a este; la semana se recalcula desde el día
+        semanas = {dia: self.__semana(dia) for dia in datos.get("litros_por_dia", {})}
+        with self.__lock:
+            for dia, litros in datos.get("litros_por_dia", {}).items():
+                semana = semanas[dia]
+                self.__litros_por_dia[dia] = self.__litros_por_dia.get(dia, 0) + litros
+                self.__litros_por_semana[semana] = self.__litros_por_semana.get(semana, 0) + litros
+            for campo, destino in (("riegos_por_dia", self.__riegos_por_dia), ("rechazos_por_dia", self.__rechazos_por_dia)):
+                for dia, por_modo in datos.get(campo, {}).items():
+                    acumulado = destino.setdefault(dia, {})
+                    for modo, cantidad in por_modo.items():
+                        acumulado[modo] = acumulado.get(modo, 0) + cantidad
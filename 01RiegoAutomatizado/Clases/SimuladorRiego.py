@@ -0,0 +1,68 @@
+# Simulador de balance hídrico de varios días para planificar las cargas de agua.
+# Datos de entrada
+    # • flota (FlotaRiego): se usan copias de sus columnas, las parcelas reales no se modifican ni se imprime nada.
+    # • dias, modo (estricto/parcial) y riegos_por_dia.
+    # • cargas: litros que llegan cada día, como arreglo (dias, parcelas); también se acepta (parcelas,) o un número
+    #   para repetir la misma carga todos los días.
+# Resultado (diccionario de arreglos NumPy)
+    # • demanda_diaria / aplicado_diario: totales de la flota por día.
+    # • faltante_por_parcela: litros pedidos que no se pudieron aplicar en todo el período.
+    # • primer_dia_parcial / primer_dia_rechazo: primer día (desde 0) con riego parcial o rechazado; -1 si nunca pasó.
+    # • litros_finales: saldo de cada parcela al terminar.
+# Reglas de negocio
+    # • Cada día primero entran las cargas y después se riega, con la misma lógica que regar_automatico.
+    # • Las parcelas que no pueden regar (inactivas, riego inhabilitado o tasa ≤ 0) no tienen demanda.
+"""--------------------------------------------------------------------------------------------------------------- """
+import numpy as np
+
+from Clases.FlotaRiego import MODOS_RIEGO, calcular_riego
+
+
+def simular(flota, dias: int, modo: str = "estricto", cargas=None, riegos_por_dia: int = 1) -> dict:
+    if dias <= 0 or riegos_por_dia <= 0:
+        raise ValueError("La cantidad de días y de riegos por día debe ser mayor a 0.")
+    if modo not in MODOS_RIEGO:
+        raise ValueError("Modo de riego inválido. Use 'estricto' o 'parcial'.")
+
+    columnas = flota.columnas()
+    litros = columnas["litros_disponibles"]
+    umbral = columnas["umbral_min_litros"]
+    permitido = columnas["permitido"]
+    demanda = np.where(permitido, columnas["superficie_ha"] * columnas["tasa_riego_l_ha"], 0.0)
+    n = len(litros)
+
+    if cargas is None:
+        cargas = np.zeros((dias, n))
+    else:
+        cargas = np.broadcast_to(np.asarray(cargas, dtype=float), (dias, n)) # vista, no copia
+        if (cargas < 0).any():
+            raise ValueError("Las cargas de agua no pueden ser negativas.")
+
+    demanda_diaria = np.full(dias, demanda.sum() * riegos_por_dia)
+    aplicado_diario = np.zeros(dias)
+    faltante = np.zeros(n)
+    primer_parcial = np.full(n, -1)
+    primer_rechazo = np.full(n, -1)
+
+    for dia in range(dias):
+        litros += cargas[dia]
+        for _ in range(riegos_por_dia):
+            aplicados = calcular_riego(litros, demanda, umbral, permitido, modo)
+            litros -= aplicados
+            aplicado_diario[dia] += aplicados.sum()
+            faltante += demanda - aplicados
+
+            # Solo se anota el primer día: se marcan las parcelas que todavía tienen -1
+            rechazo = permitido & (aplicados <= 0)
+            parcial = (aplicados > 0) & (aplicados < demanda)
+            primer_rechazo[rechazo & (primer_rechazo < 0)] = dia
+            primer_parcial[parcial & (primer_parcial < 0)] = dia
+
+    return {
+        "demanda_diaria": demanda_diaria,
+        "aplicado_diario": aplicado_diario,
+        "faltante_por_parcela": faltante,
+        "primer_dia_parcial": primer_parcial,
+        "primer_dia_rechazo": primer_rechazo,
+        "litros_finales": litros,
+    }
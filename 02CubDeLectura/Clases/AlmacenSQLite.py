@@ -0,0 +1,161 @@
+# Almacenamiento opcional en SQLite para el club de lectura (publicaciones, libros y sus eventos).
+# Datos
+    # • tabla publicaciones: id_publicacion, tipo, titulo, anio, paginas_totales.
+    # • tabla eventos: id_publicacion, origen ("historial" o "lectura"), timestamp y el evento completo en JSON.
+# Operaciones
+    # • encolar_publicacion(...) / encolar_evento(...) → no escriben en el momento: dejan el dato en una cola.
+    # • un hilo escritor saca de la cola por lotes y los inserta con executemany dentro de una sola transacción.
+    # • consultar(sql, parametros) → lectura con una conexión tomada de un pool chico.
+    # • vaciar() → espera a que se escriba todo lo pendiente; cerrar() → vacía y termina el hilo.
+    # • lotes_perdidos() → los lotes que no se pudieron escribir: (error, [(sentencia, parámetros), ...]) para reintentar.
+# Reglas de negocio
+    # • leer(), actualizar_titulo() y actualizar_anio() nunca esperan al disco: solo encolan.
+    # • WAL + synchronous=FULL: cada lote confirmado sobrevive a un corte de luz (un fsync por lote, no por evento).
+    # • Si un lote falla (cualquier error, ej: un id que no entra en INTEGER de SQLite) se deshace entero y se guarda en
+    #   lotes_perdidos; el hilo escritor nunca se corta por un lote y vaciar()/cerrar() avisan.
+    # • cerrar() desconecta el almacen de Publicacion si estaba conectado; encolar en un almacen cerrado es un error.
+    # • Las sentencias SQL son siempre las mismas, así sqlite3 reutiliza las ya preparadas (caché de sentencias).
+"""---------------------------------------------------------------------------------------------------------------------------------------------------------------------"""
+import json
+import queue
+import sqlite3
+import threading
+
+from Clases.Publicacion import Publicacion
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS publicaciones (
+    id_publicacion INTEGER PRIMARY KEY,
+    tipo TEXT NOT NULL,
+    titulo TEXT NOT NULL,
+    anio INTEGER NOT NULL,
+    paginas_totales INTEGER
+);
+CREATE TABLE IF NOT EXISTS eventos (
+    id_evento INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_publicacion INTEGER NOT NULL,
+    origen TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    datos TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_eventos_publicacion ON eventos (id_publicacion, timestamp);
+"""
+
+_GUARDAR_PUBLICACION = """
+INSERT INTO publicaciones (id_publicacion, tipo, titulo, anio, paginas_totales) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (id_publicacion) DO UPDATE SET tipo = excluded.tipo, titulo = excluded.titulo, anio = excluded.anio,
+    paginas_totales = COALESCE(excluded.paginas_totales, publicaciones.paginas_totales)
+"""
+_GUARDAR_EVENTO = "INSERT INTO eventos (id_publicacion, origen, timestamp, datos) VALUES (?, ?, ?, ?)"
+
+_FIN = object() # aviso para que el hilo escritor termine
+
+
+class AlmacenSQLite:
+
+    def __init__(self, ruta: str, tamanio_lote: int = 500, conexiones_lectura: int = 4):
+        if tamanio_lote <= 0 or conexiones_lectura <= 0:
+            raise ValueError("El tamaño de lote y la cantidad de conexiones deben ser mayores a 0.")
+
+        self.__ruta = ruta
+        self.__tamanio_lote = tamanio_lote
+        self.__cola = queue.Queue()
+        self.__error = None
+        self.__perdidos = [] # (error, filas) de cada lote que no se pudo escribir
+        self.__cerrado = False
+
+        conexion = self.__conectar()
+        conexion.executescript(_ESQUEMA)
+        conexion.close()
+
+        self.__pool = queue.Queue()
+        for _ in range(conexiones_lectura):
+            self.__pool.put(self.__conectar())
+
+        self.__escritor = threading.Thread(target=self.__escribir, name="AlmacenSQLite-escritor", daemon=True)
+        self.__escritor.start()
+
+    """ Métodos----------------------------------------------------------------------------------------------------------------------------------------------------------"""
+    def __conectar(self):
+        conexion = sqlite3.connect(self.__ruta, check_same_thread=False, cached_statements=32)
+        conexion.execute("PRAGMA journal_mode=WAL")
+        conexion.execute("PRAGMA synchronous=FULL")
+        return conexion
+
+    def __encolar(self, item):
+        if self.__cerrado:
+            raise Exception("El almacen está cerrado; no se pueden encolar más datos.")
+        self.__cola.put(item)
+
+    def encolar_publicacion(self, id_publicacion: int, tipo: str, titulo: str, anio: int, paginas_totales: int = None):
+        self.__encolar((_GUARDAR_PUBLICACION, (id_publicacion, tipo, titulo, anio, paginas_totales)))
+
+    def encolar_evento(self, id_publicacion: int, origen: str, evento: dict):
+        # default=str: los eventos de lectura tienen la fecha como datetime
+        datos = json.dumps(evento, ensure_ascii=False, default=str)
+        self.__encolar((_GUARDAR_EVENTO, (id_publicacion, origen, evento.get("timestamp", 0.0), datos)))
+
+    def __escribir(self):
+        conexion = self.__conectar() # conexión propia del hilo escritor, se reutiliza siempre
+        terminar = False
+        while not terminar:
+            lote = [self.__cola.get()]
+            while len(lote) < self.__tamanio_lote: # se junta lo que ya esté esperando, sin bloquear
+                try:
+                    lote.append(self.__cola.get_nowait())
+                except queue.Empty:
+                    break
+
+            # Se agrupan filas seguidas con la misma sentencia para un solo executemany, respetando el orden
+            grupos = []
+            for item in lote:
+                if item is _FIN:
+                    terminar = True
+                    continue
+                sentencia, parametros = item
+                if grupos and grupos[-1][0] == sentencia:
+                    grupos[-1][1].append(parametros)
+                else:
+                    grupos.append((sentencia, [parametros]))
+            try:
+                with conexion: # una transacción por lote
+                    for sentencia, filas in grupos:
+                        conexion.executemany(sentencia, filas)
+            except Exception as e: # no solo sqlite3.Error: ej. OverflowError con un entero de más de 64 bits
+                # Se informa en vaciar()/cerrar() y el lote queda guardado; el hilo sigue atendiendo la cola
+                self.__perdidos.append((e, [(sentencia, parametros) for sentencia, filas in grupos for parametros in filas]))
+                self.__error = e
+            finally:
+                for _ in lote:
+                    self.__cola.task_done()
+        conexion.close()
+
+    def vaciar(self):
+        self.__cola.join()
+        if self.__error is not None:
+            error, self.__error = self.__error, None
+            raise sqlite3.Error(f"{len(self.__perdidos)} lote(s) sin escribir, ver lotes_perdidos(): {error}") from error
+
+    def lotes_perdidos(self) -> list:
+        return list(self.__perdidos)
+
+    def consultar(self, sql: str, parametros: tuple = ()) -> list:
+        conexion = self.__pool.get() # si están todas en uso, espera a que se libere una
+        try:
+            return conexion.execute(sql, parametros).fetchall()
+        finally:
+            self.__pool.put(conexion)
+
+    def cerrar(self):
+        if Publicacion._almacen is self:
+            Publicacion.conectar_almacen(None)
+        if self.__cerrado:
+            return
+        self.__cerrado = True
+        self.__cola.put(_FIN)
+        self.__escritor.join()
+        while not self.__pool.empty():
+            self.__pool.get_nowait().close()
+        if self.__error is not None:
+            error, self.__error = self.__error, None
+            raise sqlite3.Error(f"{len(self.__perdidos)} lote(s) sin escribir, ver lotes_perdidos(): {error}") from error
@@ -0,0 +1,127 @@
+# Detector de títulos casi duplicados (mismo libro cargado con otro id y el título escrito un poco distinto).
+# Datos
+    # • por publicación: sus trigramas de letras (del título normalizado) y su firma MinHash.
+    # • cubetas LSH: (anio, banda, valores de la banda) → ids. La firma se parte en bandas; dos títulos parecidos
+    #   coinciden en al menos una banda con alta probabilidad.
+# Operaciones
+    # • normalizar(titulo) → minúsculas, sin acentos, sin signos y con un solo espacio entre palabras.
+    # • agregar(id, titulo, anio, objeto) / agregar_publicacion(publicacion).
+    # • candidatos(titulo, anio) → [(objeto, similitud)] de mayor a menor similitud.
+    # • revisar(id, titulo, anio, objeto) → candidatos(...) y después agregar(...), para usar durante una carga.
+# Reglas de negocio
+    # • Solo se comparan títulos del mismo anio (o a ± tolerancia_anio); así "Cien años de soledad" de 1967 y una
+    #   reedición de 2007 no se marcan como duplicados salvo que se pida.
+    # • Cada título se compara solo con los que caen en sus mismas cubetas (no contra todos: la carga es ~lineal).
+    # • Un candidato se informa solo si la similitud de Jaccard real de los trigramas es ≥ umbral.
+"""---------------------------------------------------------------------------------------------------------------------------------------------------------------------"""
+import random
+import re
+import zlib
+
+from Clases.IndiceTitulos import quitar_acentos
+
+_NO_PALABRA = re.compile(r"[\W_]+")
+_PRIMO = (1 << 61) - 1 # primo de Mersenne, mayor que cualquier crc32
+
+
+def normalizar(titulo: str) -> str:
+    return _NO_PALABRA.sub(" ", quitar_acentos(titulo.lower())).strip()
+
+
+def trigramas(titulo: str) -> set:
+    texto = f" {normalizar(titulo)} " # los espacios de borde marcan inicio y fin de palabra
+    if len(texto) <= 3:
+        return {texto}
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def jaccard(a: set, b: set) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class DetectorDuplicados:
+
+    def __init__(self, umbral: float = 0.7, bandas: int = 16, filas_por_banda: int = 4, tolerancia_anio: int = 0, semilla: int = 1):
+        if not 0 < umbral <= 1:
+            raise ValueError("El umbral debe estar entre 0 y 1.")
+        if bandas <= 0 or filas_por_banda <= 0:
+            raise ValueError("La cantidad de bandas y de filas por banda debe ser mayor a 0.")
+        if tolerancia_anio < 0:
+            raise ValueError("La tolerancia de años no puede ser negativa.")
+
+        self.__umbral = umbral
+        self.__bandas = bandas
+        self.__filas = filas_por_banda
+        self.__tolerancia_anio = tolerancia_anio
+        # Una función de hash (a·h + b) mod p por cada posición de la firma, siempre las mismas para una semilla
+        azar = random.Random(semilla)
+        self.__coeficientes = [(azar.randrange(1, _PRIMO), azar.randrange(0, _PRIMO)) for _ in range(bandas * filas_por_banda)]
+        self.__cubetas = {}      # (anio, banda, valores) → lista de ids
+        self.__trigramas = {}    # id → trigramas del título
+        self.__objetos = {}      # id → objeto que se informa como candidato
+        self.__hashes_de = {}    # trigrama → sus hashes ya permutados (los trigramas se repiten mucho entre títulos)
+
+    def __len__(self):
+        return len(self.__trigramas)
+
+    """ Métodos----------------------------------------------------------------------------------------------------------------------------------------------------------"""
+    def __hashes(self, grama: str) -> tuple:
+        hashes = self.__hashes_de.get(grama)
+        if hashes is None:
+            h = zlib.crc32(grama.encode("utf-8"))
+            hashes = self.__hashes_de[grama] = tuple((a * h + b) % _PRIMO for a, b in self.__coeficientes)
+        return hashes
+
+    def __firma(self, gramas: set) -> tuple:
+        # Mínimo posición a posición entre los hashes de todos los trigramas
+        return tuple(map(min, zip(*(self.__hashes(g) for g in gramas))))
+
+    def __claves(self, firma: tuple, anio: int):
+        for banda in range(self.__bandas):
+            yield (anio, banda, firma[banda * self.__filas:(banda + 1) * self.__filas])
+
+    def __buscar(self, gramas: set, firma: tuple, anio: int) -> list:
+        vistos = set()
+        for anio_vecino in range(anio - self.__tolerancia_anio, anio + self.__tolerancia_anio + 1):
+            for clave in self.__claves(firma, anio_vecino):
+                vistos.update(self.__cubetas.get(clave, ()))
+
+        resultado = []
+        for id_candidato in vistos: # solo los que comparten alguna cubeta se comparan de verdad
+            similitud = jaccard(gramas, self.__trigramas[id_candidato])
+            if similitud >= self.__umbral:
+                resultado.append((self.__objetos[id_candidato], similitud))
+        resultado.sort(key=lambda par: par[1], reverse=True)
+        return resultado
+
+    def candidatos(self, titulo: str, anio: int) -> list:
+        gramas = trigramas(titulo)
+        return self.__buscar(gramas, self.__firma(gramas), anio)
+
+    def agregar(self, id_publicacion, titulo: str, anio: int, objeto=None):
+        gramas = trigramas(titulo)
+        self.__agregar(id_publicacion, gramas, self.__firma(gramas), anio, objeto)
+
+    def __agregar(self, id_publicacion, gramas: set, firma: tuple, anio: int, objeto):
+        if id_publicacion in self.__trigramas:
+            raise ValueError(f"El ID de publicación '{id_publicacion}' ya está en el detector.")
+        self.__trigramas[id_publicacion] = gramas
+        self.__objetos[id_publicacion] = id_publicacion if objeto is None else objeto
+        for clave in self.__claves(firma, anio):
+            self.__cubetas.setdefault(clave, []).append(id_publicacion)
+
+    def agregar_publicacion(self, publicacion):
+        self.agregar(publicacion.id_publicacion, publicacion.titulo, publicacion.anio, publicacion)
+
+    def revisar(self, id_publicacion, titulo: str, anio: int, objeto=None) -> list:
+        # La firma se calcula una sola vez para buscar y para agregar
+        gramas = trigramas(titulo)
+        firma = self.__firma(gramas)
+        encontrados = self.__buscar(gramas, firma, anio)
+        self.__agregar(id_publicacion, gramas, firma, anio, objeto)
+        return encontrados
+
+    def revisar_publicacion(self, publicacion) -> list:
+        return self.revisar(publicacion.id_publicacion, publicacion.titulo, publicacion.anio, publicacion)
@@ -0,0 +1,88 @@
+# Historial de eventos ordenado por tiempo, con consultas por rango usando búsqueda binaria.
+# Datos
+    # • eventos (diccionarios) y, en paralelo, su marca de tiempo numérica (segundos, como time.time()).
+# Operaciones
+    # • agregar(evento, marca) → casi siempre es un append; si la marca llega atrasada se inserta en su lugar.
+    # • entre(inicio, fin) → VistaEventos con los eventos de ese rango (inclusivo), sin copiar la lista.
+# Reglas de negocio
+    # • inicio/fin pueden ser números (timestamp) o datetime.
+    # • La vista es de solo lectura: se puede recorrer, indexar y medir (len), pero no modificar.
+"""---------------------------------------------------------------------------------------------------------------------------------------------------------------------"""
+import bisect
+import threading
+from collections.abc import Sequence
+from datetime import datetime
+
+
+def _a_marca(instante) -> float:
+    if isinstance(instante, datetime):
+        return instante.timestamp()
+    return float(instante)
+
+
+class VistaEventos(Sequence):
+    # Ventana [inicio, fin) sobre la lista de eventos del historial; no copia nada
+
+    def __init__(self, eventos: list, inicio: int, fin: int):
+        self.__eventos = eventos
+        self.__inicio = inicio
+        self.__fin = fin
+
+    def __len__(self):
+        return self.__fin - self.__inicio
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            inicio, fin, paso = indice.indices(len(self))
+            if paso != 1:
+                return [self[i] for i in range(inicio, fin, paso)]
+            return VistaEventos(self.__eventos, self.__inicio + inicio, self.__inicio + max(inicio, fin))
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("Índice fuera del rango de la vista.")
+        return self.__eventos[self.__inicio + indice]
+
+    def __iter__(self):
+        for i in range(self.__inicio, self.__fin):
+            yield self.__eventos[i]
+
+    def __repr__(self):
+        return f"VistaEventos({len(self)} eventos)"
+
+
+class HistorialTemporal(Sequence):
+
+    def __init__(self):
+        self.__eventos = []
+        self.__marcas = []
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__eventos)
+
+    def __getitem__(self, indice):
+        return self.__eventos[indice]
+
+    def __iter__(self):
+        return iter(self.__eventos)
+
+    def __repr__(self):
+        return repr(self.__eventos)
+
+    """ Métodos----------------------------------------------------------------------------------------------------------------------------------------------------------"""
+    def agregar(self, evento: dict, marca: float):
+        with self.__lock:
+            if not self.__marcas or marca >= self.__marcas[-1]:
+                self.__eventos.append(evento)
+                self.__marcas.append(marca)
+                return
+            # El reloj se atrasó (o el evento viene de antes): se inserta en orden
+            posicion = bisect.bisect_right(self.__marcas, marca)
+            self.__marcas.insert(posicion, marca)
+            self.__eventos.insert(posicion, evento)
+
+    def entre(self, inicio=None, fin=None) -> VistaEventos:
+        desde = 0 if inicio is None else bisect.bisect_left(self.__marcas, _a_marca(inicio))
+        hasta = len(self.__marcas) if fin is None else bisect.bisect_right(self.__marcas, _a_marca(fin))
+        return VistaEventos(self.__eventos, desde, max(desde, hasta))
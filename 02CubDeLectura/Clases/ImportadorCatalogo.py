@@ -0,0 +1,151 @@
+# Importación masiva del catálogo (Publicacion y Libro) desde archivos CSV o JSONL.
+# Archivo
+    # • columnas id_publicacion, titulo, anio y opcional paginas_totales (si viene, se crea un Libro).
+# Operaciones
+    # • leer_filas(ruta, rechazo) → generador de (número de línea, fila); una línea JSONL mal formada va a rechazo.
+    # • importar_catalogo(ruta, tamanio_lote, rechazo, detector, duplicado) → generador que devuelve una lista de objetos
+    #   creados por lote.
+# Reglas de negocio
+    # • Se validan las mismas reglas que en el constructor (id entero positivo y único, título no vacío, anio ≥ 1450,
+    #   páginas > 0), pero por lote: los ids se comparan de una vez contra el lote y contra Publicacion._ids_existentes.
+    # • id_publicacion, anio y paginas_totales deben ser enteros, igual que en el constructor: 3.9, "1999.8" o true se
+    #   rechazan en vez de truncarse; titulo debe ser un texto.
+    # • Las filas rechazadas no cortan la importación; se informan a rechazo(linea, fila, motivo).
+    # • Los constructores imprimen mensajes; durante la importación se descartan. La validación (y rechazo) corre antes,
+    #   fuera de ese bloque, así lo que imprima rechazo sí se ve.
+    # • Solo hay un lote en memoria a la vez; los objetos los guarda quien consume el generador.
+    # • Con un DetectorDuplicados, cada publicación creada se compara con las ya vistas (título parecido y mismo anio) y los
+    #   posibles duplicados se informan a duplicado(linea, publicacion, candidatos). No se rechazan: el id es distinto.
+"""---------------------------------------------------------------------------------------------------------------------------------------------------------------------"""
+import contextlib
+import csv
+import itertools
+import json
+import os
+
+from Clases.Publicacion import Publicacion
+from Clases.Libro import Libro
+
+
+def leer_filas(ruta: str, rechazo=None):
+    extension = os.path.splitext(ruta)[1].lower()
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        if extension == ".csv":
+            for numero, fila in enumerate(csv.DictReader(archivo), start=2): # la línea 1 es el encabezado
+                yield numero, fila
+        elif extension in (".jsonl", ".ndjson"):
+            for numero, linea in enumerate(archivo, start=1):
+                if not linea.strip():
+                    continue
+                try:
+                    fila = json.loads(linea)
+                except json.JSONDecodeError as e:
+                    if rechazo is not None:
+                        rechazo(numero, linea.rstrip("\n"), f"Fila con formato inválido: {e}")
+                    continue
+                yield numero, fila
+        else:
+            raise ValueError(f"Formato de archivo no soportado: '{extension}'. Use .csv o .jsonl.")
+
+
+def _entero(valor, campo: str) -> int:
+    # Acepta 12, "12" o 12.0 (JSON); rechaza 12.7, "12.7", true y lo que no sea número, con un mensaje claro
+    if isinstance(valor, bool) or not isinstance(valor, (int, float, str)):
+        raise ValueError(f"El campo '{campo}' debe ser un número entero.")
+    if isinstance(valor, int):
+        return valor
+    if isinstance(valor, str):
+        try:
+            return int(valor.strip())
+        except ValueError:
+            raise ValueError(f"El campo '{campo}' debe ser un número entero.") from None
+    if not valor.is_integer():
+        raise ValueError(f"El campo '{campo}' debe ser un número entero.")
+    return int(valor)
+
+
+def _convertir(fila) -> dict:
+    if not isinstance(fila, dict):
+        raise ValueError("La fila debe ser un objeto con campos (ej: {\"id_publicacion\": 1, ...}).")
+    for campo in ("id_publicacion", "anio"):
+        if campo not in fila:
+            raise ValueError(f"Falta el campo '{campo}'.")
+    titulo = fila.get("titulo")
+    if titulo is not None and not isinstance(titulo, str):
+        raise ValueError("El campo 'titulo' debe ser un texto.")
+    paginas = fila.get("paginas_totales")
+    return {
+        "id_publicacion": _entero(fila["id_publicacion"], "id_publicacion"),
+        "titulo": titulo or "",
+        "anio": _entero(fila["anio"], "anio"),
+        "paginas_totales": None if paginas in (None, "") else _entero(paginas, "paginas_totales"),
+    }
+
+
+def validar_lote(lote: list, rechazo=None) -> list:
+    # lote: lista de (linea, fila). Devuelve la lista de (linea, datos) válidos.
+    validos = []
+    ids_del_lote = set()
+    for numero, fila in lote:
+        try:
+            datos = _convertir(fila)
+            if datos["id_publicacion"] in ids_del_lote:
+                raise Exception(f"El ID de publicación '{datos['id_publicacion']}' está repetido en el archivo.")
+            if not datos["titulo"].strip():
+                raise Exception("El título no puede estar vacío.")
+            if datos["anio"] < 1450:
+                raise Exception("El año de publicación debe ser 1450 o posterior.")
+            if datos["paginas_totales"] is not None and datos["paginas_totales"] <= 0:
+                raise Exception("El total de páginas debe ser mayor a 0.")
+            if datos["id_publicacion"] <= 0:
+                raise Exception("El ID de publicación debe ser un número entero positivo.")
+        except (KeyError, TypeError, ValueError) as e:
+            if rechazo is not None:
+                rechazo(numero, fila, f"Fila con formato inválido: {e}")
+            continue
+        except Exception as e:
+            if rechazo is not None:
+                rechazo(numero, fila, str(e))
+            continue
+        ids_del_lote.add(datos["id_publicacion"])
+        validos.append((numero, fila, datos))
+
+    # Unicidad contra lo ya registrado, de una vez para todo el lote
+    repetidos = ids_del_lote & Publicacion._ids_existentes
+    if repetidos:
+        for numero, fila, datos in validos:
+            if datos["id_publicacion"] in repetidos and rechazo is not None:
+                rechazo(numero, fila, f"El ID de publicación '{datos['id_publicacion']}' ya está registrado. Debe ser único.")
+        validos = [v for v in validos if v[2]["id_publicacion"] not in repetidos]
+    return validos
+
+
+def importar_catalogo(ruta: str, tamanio_lote: int = 5000, rechazo=None, detector=None, duplicado=None):
+    if tamanio_lote <= 0:
+        raise ValueError("El tamaño de lote debe ser mayor a 0.")
+
+    filas = leer_filas(ruta, rechazo)
+    while True:
+        lote = list(itertools.islice(filas, tamanio_lote))
+        if not lote:
+            break
+
+        validos = validar_lote(lote, rechazo)
+        creados = []
+        sospechosos = []
+        with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+            for numero, fila, datos in validos:
+                if datos["paginas_totales"] is None:
+                    publicacion = Publicacion(datos["id_publicacion"], datos["titulo"], datos["anio"])
+                else:
+                    publicacion = Libro(datos["id_publicacion"], datos["titulo"], datos["anio"], datos["paginas_totales"])
+                creados.append(publicacion)
+                if detector is not None:
+                    candidatos = detector.revisar_publicacion(publicacion)
+                    if candidatos:
+                        sospechosos.append((numero, publicacion, candidatos))
+        # Se avisa fuera del redirect para que lo que imprima duplicado() sí se vea
+        if duplicado is not None:
+            for numero, publicacion, candidatos in sospechosos:
+                duplicado(numero, publicacion, candidatos)
+        yield creados
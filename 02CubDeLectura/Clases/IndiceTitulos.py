@@ -0,0 +1,129 @@
+# Índice de títulos para buscar publicaciones sin recorrer todos los objetos.
+# Datos
+    # • índice invertido: palabra del título → ids de publicaciones que la tienen (uno normal y otro sin acentos).
+    # • lista ordenada de palabras, para buscar por prefijo con búsqueda binaria (bisect).
+# Operaciones
+    # • agregar(publicacion) / actualizar(publicacion) → los llama Publicacion en __init__ y actualizar_titulo.
+    # • buscar(texto, sin_acentos) → publicaciones que tienen todas las palabras del texto.
+    # • buscar_prefijo(texto, sin_acentos) → igual, pero la última palabra puede estar incompleta ("cien a" → "Cien años...").
+# Reglas de negocio
+    # • Las palabras se comparan en minúsculas; con sin_acentos=True además se ignoran tildes ("anos" encuentra "años").
+    # • Al cambiar un título solo se tocan las palabras que salieron o entraron.
+"""---------------------------------------------------------------------------------------------------------------------------------------------------------------------"""
+import bisect
+import functools
+import re
+import unicodedata
+
+_PALABRA = re.compile(r"\w+")
+
+
+def tokenizar(texto: str) -> list:
+    return _PALABRA.findall(texto.lower())
+
+
+def quitar_acentos(texto: str) -> str:
+    if texto.isascii(): # la mayoría de las palabras no tiene tildes: no hace falta normalizar
+        return texto
+    return _quitar_acentos(texto)
+
+
+@functools.lru_cache(maxsize=65536) # las palabras con tilde se repiten mucho entre títulos
+def _quitar_acentos(texto: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(c))
+
+
+class _IndiceInvertido:
+    # Un índice palabra → ids, con las palabras también en una lista ordenada para los prefijos
+
+    def __init__(self):
+        self.__ids_por_palabra = {}
+        self.__palabras_ordenadas = []
+
+    def agregar(self, palabras: set, id_publicacion):
+        for palabra in palabras:
+            ids = self.__ids_por_palabra.get(palabra)
+            if ids is None:
+                ids = self.__ids_por_palabra[palabra] = set()
+                bisect.insort(self.__palabras_ordenadas, palabra)
+            ids.add(id_publicacion)
+
+    def quitar(self, palabras: set, id_publicacion):
+        for palabra in palabras:
+            ids = self.__ids_por_palabra.get(palabra)
+            if ids is None:
+                continue
+            ids.discard(id_publicacion)
+            if not ids:
+                del self.__ids_por_palabra[palabra]
+                del self.__palabras_ordenadas[bisect.bisect_left(self.__palabras_ordenadas, palabra)]
+
+    def ids_exactos(self, palabra: str) -> set:
+        return self.__ids_por_palabra.get(palabra, set())
+
+    def ids_con_prefijo(self, prefijo: str) -> set:
+        ids = set()
+        palabras = self.__palabras_ordenadas
+        posicion = bisect.bisect_left(palabras, prefijo)
+        while posicion < len(palabras) and palabras[posicion].startswith(prefijo): # se corta apenas deja de coincidir
+            ids |= self.__ids_por_palabra[palabras[posicion]]
+            posicion += 1
+        return ids
+
+
+class IndiceTitulos:
+
+    def __init__(self):
+        self.__publicaciones = {}   # id → publicación
+        self.__palabras_de = {}     # id → (palabras, palabras sin acentos) que se indexaron
+        self.__normal = _IndiceInvertido()
+        self.__sin_acentos = _IndiceInvertido()
+
+    def __len__(self):
+        return len(self.__publicaciones)
+
+    """ Métodos----------------------------------------------------------------------------------------------------------------------------------------------------------"""
+    def agregar(self, publicacion):
+        palabras = set(tokenizar(publicacion.titulo))
+        palabras_sin_acentos = {quitar_acentos(p) for p in palabras}
+        self.__publicaciones[publicacion.id_publicacion] = publicacion
+        self.__palabras_de[publicacion.id_publicacion] = (palabras, palabras_sin_acentos)
+        self.__normal.agregar(palabras, publicacion.id_publicacion)
+        self.__sin_acentos.agregar(palabras_sin_acentos, publicacion.id_publicacion)
+
+    def actualizar(self, publicacion):
+        anteriores, anteriores_sin_acentos = self.__palabras_de.get(publicacion.id_publicacion, (set(), set()))
+        palabras = set(tokenizar(publicacion.titulo))
+        palabras_sin_acentos = {quitar_acentos(p) for p in palabras}
+
+        # Solo la diferencia entre el título viejo y el nuevo
+        self.__normal.quitar(anteriores - palabras, publicacion.id_publicacion)
+        self.__normal.agregar(palabras - anteriores, publicacion.id_publicacion)
+        self.__sin_acentos.quitar(anteriores_sin_acentos - palabras_sin_acentos, publicacion.id_publicacion)
+        self.__sin_acentos.agregar(palabras_sin_acentos - anteriores_sin_acentos, publicacion.id_publicacion)
+        self.__publicaciones[publicacion.id_publicacion] = publicacion
+        self.__palabras_de[publicacion.id_publicacion] = (palabras, palabras_sin_acentos)
+
+    def __buscar(self, texto: str, sin_acentos: bool, ultima_es_prefijo: bool) -> list:
+        if sin_acentos:
+            texto = quitar_acentos(texto)
+        palabras = tokenizar(texto)
+        if not palabras:
+            return []
+
+        indice = self.__sin_acentos if sin_acentos else self.__normal
+        conjuntos = [indice.ids_exactos(p) for p in palabras[:-1]]
+        conjuntos.append(indice.ids_con_prefijo(palabras[-1]) if ultima_es_prefijo else indice.ids_exactos(palabras[-1]))
+        conjuntos.sort(key=len) # se intersecta empezando por el conjunto más chico
+        ids = set(conjuntos[0])
+        for otro in conjuntos[1:]:
+            if not ids:
+                break
+            ids &= otro
+        return [self.__publicaciones[i] for i in ids]
+
+    def buscar(self, texto: str, sin_acentos: bool = False) -> list:
+        return self.__buscar(texto, sin_acentos, False)
+
+    def buscar_prefijo(self, texto: str, sin_acentos: bool = False) -> list:
+        return self.__buscar(texto, sin_acentos, True)
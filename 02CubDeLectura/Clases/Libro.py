@@ -11,22 +11,45 @@
     # No se pueden leer páginas negativas ni más que las restantes.
     # paginas_totales no puede cambiarse una vez creado el libro.
     # Toda lectura queda registrada en eventos_lectura con fecha.
+# Historial por tiempo
+    # Cada evento de lectura guarda "timestamp" (igual que historial_eventos); lecturas_entre(inicio, fin) usa bisect.
+# Lectura por miembro del club
+    # leer(paginas, miembro) → progreso propio de cada miembro (ProgresoMiembros), seguro entre hilos.
+    # consultar_progreso(miembro) → % de ese miembro; consultar_progreso_club() → promedio de todos los miembros.
+# Ranking del club (RankingLectura, se actualiza en cada leer)
+    # Libro.top_libros(k), Libro.top_lectores(k), Libro.estadisticas_club() → sin recalcular ni ordenar todo.
+# Persistencia opcional
+    # Con un almacen conectado (Publicacion.conectar_almacen) los eventos de lectura también se encolan para SQLite.
 """---------------------------------------------------------------------------------------------------------------------------------------------------------------------"""
 
 from datetime import datetime
+import threading
+import time
 from Clases.Publicacion import Publicacion
+from Clases.HistorialTemporal import HistorialTemporal
+from Clases.ProgresoMiembros import ProgresoMiembros
+from Clases.RankingLectura import RankingLectura
 
 class Libro(Publicacion):
+
+    _ranking_libros = RankingLectura()    # id_publicacion → progreso general del libro
+    _ranking_lectores = RankingLectura()  # (miembro, id_publicacion) → progreso de ese miembro en ese libro
+
     def __init__(self, id_publicacion: int, titulo: str, anio: int, paginas_totales: int):
-        super().__init__(id_publicacion, titulo, anio)
-        
-        # Validación de paginas_totales, tiene que ser > 0
+        # Validación de paginas_totales, tiene que ser > 0. Va antes de Publicacion.__init__, que ya registra el id,
+        # indexa el título y encola en el almacen: si fallara después, quedaría una publicación a medio crear.
         if paginas_totales <= 0: 
             raise Exception("El total de páginas debe ser mayor a 0.")
+
+        super().__init__(id_publicacion, titulo, anio)
         
         self.__paginas_totales = paginas_totales
         self.__paginas_leidas = 0
-        self.__eventos_lectura = []  # Lista de diccionarios con eventos de lectura
+        self.__eventos_lectura = HistorialTemporal()  # Eventos de lectura ordenados por tiempo
+        self.__progreso_miembros = ProgresoMiembros(paginas_totales) # páginas leídas por cada miembro del club
+        self.__lock = threading.Lock() # protege el contador general __paginas_leidas
+        Libro._ranking_libros.actualizar(self.id_publicacion, 0.0, self)
+        self._guardar_en_almacen()
 
         self._Publicacion__registrar_evento("Creación", None, f"Libro creado con {paginas_totales} páginas.")
         self.__registrar_evento(0, "Creación del libro con páginas totales: " + str(paginas_totales))
@@ -50,40 +73,103 @@ class Libro(Publicacion):
     #No se permiten setters para paginas_totales y paginas_leidas, ya que no deben cambiarse directamente.
     
     """ Métodos--------------------------------------------------------------------------------------------------------------- """
-    def __registrar_evento(self, paginas_leidas: int, descripcion: str): 
+    def _guardar_en_almacen(self, paginas_totales: int = None):
+        # En Publicacion.__init__ todavía no hay páginas; se vuelve a guardar al final de Libro.__init__
+        super()._guardar_en_almacen(getattr(self, "_Libro__paginas_totales", paginas_totales))
+
+    def __registrar_evento(self, paginas_leidas: int, descripcion: str, acumulado: int = None, miembro=None): 
+        marca = time.time()
         evento = {
-            "fecha": datetime.now(),
+            "fecha": datetime.fromtimestamp(marca),
+            "timestamp": marca,
             "paginas_leidas": paginas_leidas,
             "descripcion": descripcion
         }
-        self.__eventos_lectura.append(evento)
+        if acumulado is not None:
+            evento["acumulado"] = acumulado
+        if miembro is not None:
+            evento["miembro"] = miembro
+        self.__eventos_lectura.agregar(evento, marca)
+        if Publicacion._almacen is not None:
+            Publicacion._almacen.encolar_evento(self.id_publicacion, "lectura", evento)
         print(f"Evento registrado: {descripcion} - Páginas leídas en este evento: {paginas_leidas} - Fecha: {evento['fecha']}")
     
-    def leer(self, paginas: int):
+    def leer(self, paginas: int, miembro=None):
+        if miembro is not None:
+            return self.__leer_miembro(paginas, miembro)
+
         if paginas <= 0:
             raise Exception("No se pueden leer páginas negativas o cero.")
         
-        paginas_restantes = self.__paginas_totales - self.__paginas_leidas
+        with self.__lock: # validar y sumar juntos, para que dos hilos no pasen el total entre los dos
+            paginas_restantes = self.__paginas_totales - self.__paginas_leidas
 
-        if paginas > paginas_restantes:
-            raise Exception(f"No se pueden leer más páginas de las restantes. Páginas restantes: {paginas_restantes}.")
+            if paginas_restantes == 0:
+                raise Exception("El libro ya ha sido leído completamente.")
 
-        if paginas_restantes == 0:
-            raise Exception("El libro ya ha sido leído completamente.")
-        
-        paginasLectura = min(paginas, paginas_restantes)
-        self.__paginas_leidas += paginasLectura
-        self.__registrar_evento_lectura(paginasLectura, self.__paginas_leidas)
-        print(f"Páginas leídas: {paginasLectura}. Total leído: {self.__paginas_leidas}/{self.__paginas_totales} páginas.")
+            if paginas > paginas_restantes:
+                raise Exception(f"No se pueden leer más páginas de las restantes. Páginas restantes: {paginas_restantes}.")
+            
+            paginasLectura = min(paginas, paginas_restantes)
+            self.__paginas_leidas += paginasLectura
+            acumulado = self.__paginas_leidas
+        # Fuera del lock del libro; la versión (páginas acumuladas) evita que un hilo atrasado pise un progreso mayor
+        Libro._ranking_libros.actualizar(self.id_publicacion, (acumulado / self.__paginas_totales) * 100, self, acumulado)
+        self.__registrar_evento(paginasLectura, f"Lectura de {paginasLectura} páginas.", acumulado)
+        print(f"Páginas leídas: {paginasLectura}. Total leído: {acumulado}/{self.__paginas_totales} páginas.")
         return paginasLectura
 
-    def consultar_progreso(self) -> float: # aquí se calcula el progreso en % de la lectura
+    def __leer_miembro(self, paginas: int, miembro):
+        # El lock es el del fragmento del miembro (ProgresoMiembros), no el del libro
+        acumulado = self.__progreso_miembros.leer(miembro, paginas)
+        Libro._ranking_lectores.actualizar((miembro, self.id_publicacion), (acumulado / self.__paginas_totales) * 100,
+                                           (miembro, self), acumulado)
+        self.__registrar_evento(paginas, f"Lectura de {paginas} páginas del miembro '{miembro}'.", acumulado, miembro)
+        print(f"Páginas leídas por '{miembro}': {paginas}. Total leído: {acumulado}/{self.__paginas_totales} páginas.")
+        return paginas
+
+    def consultar_progreso(self, miembro=None) -> float: # aquí se calcula el progreso en % de la lectura
         if self.__paginas_totales == 0:
             return 0.0
+
+        if miembro is not None:
+            return self.__progreso_miembros.progreso(miembro)
         
         return (self.__paginas_leidas / self.__paginas_totales) * 100
+
+    def consultar_progreso_club(self) -> float:
+        # Promedio del % de todos los miembros que empezaron el libro
+        return self.__progreso_miembros.progreso_club()
+
+    @staticmethod
+    def top_libros(k: int) -> list:
+        # [(libro, progreso %), ...] de mayor a menor progreso
+        return Libro._ranking_libros.top(k)
+
+    @staticmethod
+    def top_lectores(k: int) -> list:
+        # [((miembro, libro), progreso %), ...] de mayor a menor progreso
+        return Libro._ranking_lectores.top(k)
+
+    @staticmethod
+    def estadisticas_club() -> dict:
+        return {
+            "libros": Libro._ranking_libros.cantidad(),
+            "libros_completados": Libro._ranking_libros.completados(),
+            "progreso_promedio_libros": Libro._ranking_libros.promedio(),
+            "lecturas_de_miembros": Libro._ranking_lectores.cantidad(),
+            "lecturas_completadas": Libro._ranking_lectores.completados(),
+            "progreso_promedio_miembros": Libro._ranking_lectores.promedio(),
+        }
+
+    def paginas_leidas_por(self, miembro) -> int:
+        return self.__progreso_miembros.paginas_de(miembro)
     
     def ver_historial_lectura(self):
         return self.__eventos_lectura
 
+    def lecturas_entre(self, inicio=None, fin=None):
+        # Eventos de lectura entre dos instantes (timestamp o datetime, inclusivo), sin copiar la lista
+        return self.__eventos_lectura.entre(inicio, fin)
+
     
\ No newline at end of file
@@ -0,0 +1,85 @@
+# Progreso de lectura por miembro del club para un mismo libro.
+# Datos
+    # • paginas_totales del libro.
+    # • fragmentos (shards): cada uno con su lock, un diccionario miembro → páginas leídas y los totales del fragmento.
+    #   Se crean recién con la primera lectura que cae en ellos: un libro sin lectores solo tiene un diccionario vacío
+    #   (un catálogo grande no paga 16 locks y 16 diccionarios por título).
+# Operaciones
+    # • leer(miembro, paginas) → suma páginas al miembro y devuelve su acumulado.
+    # • paginas_de(miembro) / progreso(miembro) → páginas y % de un miembro.
+    # • progreso_club() → promedio del % de todos los miembros, sumando los totales de cada fragmento.
+# Reglas de negocio
+    # • Para cada miembro: 0 ≤ paginas_leidas ≤ paginas_totales, no se leen páginas ≤ 0 ni más que las restantes.
+    # • Cada miembro cae siempre en el mismo fragmento (por hash), así dos miembros de fragmentos distintos leen sin esperarse
+    #   y nunca se bloquea el libro entero.
+"""---------------------------------------------------------------------------------------------------------------------------------------------------------------------"""
+import threading
+
+
+class _Fragmento:
+    __slots__ = ("lock", "paginas", "suma")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.paginas = {}  # miembro → páginas leídas
+        self.suma = 0      # suma de páginas leídas de los miembros del fragmento
+
+
+class ProgresoMiembros:
+
+    def __init__(self, paginas_totales: int, cantidad_fragmentos: int = 16):
+        if paginas_totales <= 0:
+            raise Exception("El total de páginas debe ser mayor a 0.")
+        if cantidad_fragmentos <= 0:
+            raise ValueError("La cantidad de fragmentos debe ser mayor a 0.")
+
+        self.__paginas_totales = paginas_totales
+        self.__cantidad_fragmentos = cantidad_fragmentos
+        self.__fragmentos = {} # número de fragmento → _Fragmento, solo los que ya tuvieron una lectura
+
+    """ Métodos----------------------------------------------------------------------------------------------------------------------------------------------------------"""
+    def __fragmento(self, miembro, crear: bool = False):
+        numero = hash(miembro) % self.__cantidad_fragmentos
+        fragmento = self.__fragmentos.get(numero)
+        if fragmento is None and crear:
+            # setdefault es atómico: si dos hilos lo crean a la vez, los dos se quedan con el mismo fragmento
+            fragmento = self.__fragmentos.setdefault(numero, _Fragmento())
+        return fragmento
+
+    def leer(self, miembro, paginas: int) -> int:
+        if paginas <= 0:
+            raise Exception("No se pueden leer páginas negativas o cero.")
+
+        fragmento = self.__fragmento(miembro, crear=True)
+        with fragmento.lock: # la validación y la suma van juntas, si no dos hilos podrían pasarse del total
+            leidas = fragmento.paginas.get(miembro, 0)
+            paginas_restantes = self.__paginas_totales - leidas
+            if paginas_restantes == 0:
+                raise Exception(f"El miembro '{miembro}' ya leyó el libro completo.")
+            if paginas > paginas_restantes:
+                raise Exception(f"No se pueden leer más páginas de las restantes. Páginas restantes: {paginas_restantes}.")
+
+            fragmento.paginas[miembro] = leidas + paginas
+            fragmento.suma += paginas
+            return leidas + paginas
+
+    def paginas_de(self, miembro) -> int:
+        fragmento = self.__fragmento(miembro)
+        return 0 if fragmento is None else fragmento.paginas.get(miembro, 0)
+
+    def progreso(self, miembro) -> float:
+        return (self.paginas_de(miembro) / self.__paginas_totales) * 100
+
+    def cantidad_miembros(self) -> int:
+        return sum(len(fragmento.paginas) for fragmento in list(self.__fragmentos.values()))
+
+    def progreso_club(self) -> float:
+        # Se lee fragmento por fragmento (cada uno con su lock un instante), nunca todos a la vez
+        suma = miembros = 0
+        for fragmento in list(self.__fragmentos.values()): # copia: otro hilo puede estar creando un fragmento
+            with fragmento.lock:
+                suma += fragmento.suma
+                miembros += len(fragmento.paginas)
+        if miembros == 0:
+            return 0.0
+        return (suma / (miembros * self.__paginas_totales)) * 100
@@ -11,13 +11,37 @@
     # titulo no puede quedar vacío. CHECK
     # Ningún campo puede alterarse directamente; todo cambio pasa por operaciones. CHECK
     # Cada cambio queda en historial_eventos con fecha/hora.
+    # Cada evento guarda además "timestamp" (segundos, numérico) y el historial queda ordenado por tiempo:
+    # historial_entre(inicio, fin) devuelve una vista sin copiar, buscando con bisect.
+# Persistencia opcional (AlmacenSQLite)
+    # Publicacion.conectar_almacen(almacen) → desde ahí cada publicación y cada evento se encolan para guardarse en SQLite.
+    # Sin almacen conectado todo queda solo en memoria, igual que antes.
 """---------------------------------------------------------------------------------------------------------------------------------------------------------------------"""
 from datetime import datetime
+import time
+from Clases.IndiceTitulos import IndiceTitulos
+from Clases.HistorialTemporal import HistorialTemporal
+
+_ultima_fecha = (None, "") # (segundo, texto): el texto de la fecha se arma una sola vez por segundo
+
+def _fecha_actual(marca: float = None) -> str:
+    # Se lee y se reemplaza la tupla entera (nunca un campo suelto), así otro hilo no puede mezclar un segundo con el
+    # texto de otro; como mucho dos hilos arman el mismo texto a la vez
+    global _ultima_fecha
+    segundo = int(time.time() if marca is None else marca)
+    ultima = _ultima_fecha
+    if ultima[0] == segundo:
+        return ultima[1]
+    texto = datetime.fromtimestamp(segundo).strftime("%Y-%m-%d %H:%M:%S")
+    _ultima_fecha = (segundo, texto)
+    return texto
 
 class Publicacion:
 
     #VAmos hacer lo mismo que en parcela usando un atributo de clase para evitar ids repetidos
     _ids_existentes = set() #se utiliza set para evitar duplicados
+    _indice_titulos = IndiceTitulos() #índice de palabras del título para buscar sin recorrer todas las publicaciones
+    _almacen = None #AlmacenSQLite opcional, compartido por todas las publicaciones
 
     def __init__(self, id_publicacion: int, titulo: str, anio: int):
 
@@ -36,9 +60,11 @@ class Publicacion:
         self.__id_publicacion = id_publicacion  # Regla: No se puede cambiar después de la creación
         self.__titulo = titulo
         self.__anio = anio
-        self.__historial_eventos = []
+        self.__historial_eventos = HistorialTemporal()
 
         Publicacion._ids_existentes.add(id_publicacion) #Agregamos el id al set para evitar duplicados futuros
+        Publicacion._indice_titulos.agregar(self)
+        self._guardar_en_almacen()
 
         #Registrando ando los eventos, como en parcela
         self.__registrar_evento("Creación", None, f"id_publicacion: {self.__id_publicacion}, titulo: {self.__titulo}, anio: {self.__anio}")
@@ -70,14 +96,32 @@ class Publicacion:
     """ Métodos--------------------------------------------------------------------------------------------------------------- """
 
     def __registrar_evento(self, campo: str, valor_anterior, valor_nuevo, detalle: str = ""):
+        marca = time.time()
         evento = {
-            "fecha": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "fecha": _fecha_actual(marca),
+            "timestamp": marca,
             "campo": campo,
             "anterior": valor_anterior,
             "nuevo": valor_nuevo,
             "detalle": detalle
         }
-        self.__historial_eventos.append(evento)
+        self.__historial_eventos.agregar(evento, marca)
+        if Publicacion._almacen is not None:
+            Publicacion._almacen.encolar_evento(self.__id_publicacion, "historial", evento)
+
+    def _guardar_en_almacen(self, paginas_totales: int = None):
+        # Solo encola: el hilo escritor del almacen lo inserta después, en lote
+        if Publicacion._almacen is not None:
+            Publicacion._almacen.encolar_publicacion(self.__id_publicacion, type(self).__name__, self.__titulo, self.__anio, paginas_totales)
+
+    @staticmethod
+    def conectar_almacen(almacen):
+        # almacen=None desconecta; lo ya encolado se sigue escribiendo
+        Publicacion._almacen = almacen
+
+    def historial_entre(self, inicio=None, fin=None):
+        # Eventos entre dos instantes (timestamp o datetime, inclusivo), como vista de solo lectura
+        return self.__historial_eventos.entre(inicio, fin)
 
     def actualizar_titulo(self, nuevo_titulo: str):
         if not nuevo_titulo or nuevo_titulo.strip() == "":
@@ -85,6 +129,8 @@ class Publicacion:
         
         titulo_anterior = self.__titulo
         self.__titulo = nuevo_titulo
+        Publicacion._indice_titulos.actualizar(self) #solo cambian las palabras que entraron o salieron
+        self._guardar_en_almacen()
         self.__registrar_evento("titulo", titulo_anterior, nuevo_titulo)
         print(f"Título actualizado de '{titulo_anterior}' a '{nuevo_titulo}'.")
     
@@ -94,9 +140,18 @@ class Publicacion:
         
         anio_anterior = self.__anio
         self.__anio = nuevo_anio
+        self._guardar_en_almacen()
         self.__registrar_evento("anio", anio_anterior, nuevo_anio)
         print(f"Año actualizado de {anio_anterior} a {nuevo_anio}.")
 
+    @staticmethod
+    def buscar_por_titulo(texto: str, sin_acentos: bool = False) -> list:
+        return Publicacion._indice_titulos.buscar(texto, sin_acentos)
+
+    @staticmethod
+    def buscar_por_prefijo(texto: str, sin_acentos: bool = False) -> list:
+        return Publicacion._indice_titulos.buscar_prefijo(texto, sin_acentos)
+
     def historial(self):
         print("Historial de eventos:")
         if not self.__historial_eventos:
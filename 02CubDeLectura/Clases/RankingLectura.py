@@ -0,0 +1,92 @@
+# Ranking de progreso de lectura que se mantiene al día en cada lectura (no se recalcula ni se ordena en cada consulta).
+# Datos
+    # • heap de (-progreso, clave, serie): el tope es el de mayor progreso. Al actualizar no se busca la entrada vieja:
+    #   se agrega una nueva y la vieja queda "vencida" (otra serie); las vencidas se sacan cuando aparecen en el tope.
+    # • clave → (progreso, objeto, version, serie) con la entrada vigente de cada clave.
+    # • totales: suma de progresos y cantidad de completos (progreso = 100).
+# Operaciones
+    # • actualizar(clave, progreso, objeto, version) → O(log n) (un push en el heap).
+    # • top(k) → los k de mayor progreso: saca k entradas vigentes (y las vencidas que encuentre) y las vuelve a poner,
+    #   O((k + vencidas) log n); cada vencida se saca una sola vez.
+    # • completados() / promedio() / cantidad() → O(1).
+# Reglas de negocio
+    # • El progreso es un % entre 0 y 100.
+    # • Las claves deben poder compararse entre sí (se usan para desempatar), ej: ids o tuplas (miembro, id_libro).
+    # • version (opcional) ordena las actualizaciones de una misma clave: si llega una con versión menor que la guardada
+    #   se ignora. Libro pasa las páginas acumuladas, así dos hilos que terminan en otro orden no dejan un progreso viejo.
+    # • Si las vencidas pasan a ser mayoría, el heap se rehace una vez (igual que RecordsPersonales): nunca crece sin límite.
+"""---------------------------------------------------------------------------------------------------------------------------------------------------------------------"""
+import heapq
+import itertools
+import threading
+
+
+class RankingLectura:
+
+    def __init__(self):
+        self.__heap = []       # (-progreso, clave, serie), con entradas vencidas
+        self.__entradas = {}   # clave → (progreso, objeto, version, serie)
+        self.__series = itertools.count()
+        self.__suma = 0.0
+        self.__completados = 0
+        self.__lock = threading.Lock() # Libro.leer puede llamarse desde varios hilos
+
+    """ Métodos----------------------------------------------------------------------------------------------------------------------------------------------------------"""
+    def __vencida(self, entrada: tuple) -> bool:
+        vigente = self.__entradas.get(entrada[1])
+        return vigente is None or vigente[3] != entrada[2]
+
+    def actualizar(self, clave, progreso: float, objeto=None, version=None):
+        if progreso < 0 or progreso > 100:
+            raise ValueError("El progreso debe estar entre 0 y 100.")
+
+        with self.__lock:
+            anterior = self.__entradas.get(clave)
+            if anterior is not None:
+                if version is not None and anterior[2] is not None and version < anterior[2]:
+                    return False # ya se registró una actualización más nueva de esta clave
+                self.__suma -= anterior[0]
+                self.__completados -= anterior[0] >= 100
+
+            serie = next(self.__series)
+            heapq.heappush(self.__heap, (-progreso, clave, serie)) # la entrada anterior queda vencida
+            self.__entradas[clave] = (progreso, objeto, version, serie)
+            self.__suma += progreso
+            self.__completados += progreso >= 100
+            if len(self.__heap) > 32 and len(self.__heap) > 2 * len(self.__entradas):
+                self.__heap = [entrada for entrada in self.__heap if not self.__vencida(entrada)]
+                heapq.heapify(self.__heap)
+            return True
+
+    def top(self, k: int) -> list:
+        # Devuelve [(objeto o clave, progreso), ...] de mayor a menor
+        with self.__lock:
+            heap = self.__heap
+            vigentes = []
+            while heap and len(vigentes) < k:
+                entrada = heapq.heappop(heap)
+                if not self.__vencida(entrada): # las vencidas no vuelven al heap
+                    vigentes.append(entrada)
+            for entrada in vigentes:
+                heapq.heappush(heap, entrada)
+
+            resultado = []
+            for menos_progreso, clave, _ in vigentes:
+                objeto = self.__entradas[clave][1]
+                resultado.append((clave if objeto is None else objeto, -menos_progreso))
+            return resultado
+
+    def progreso_de(self, clave) -> float:
+        entrada = self.__entradas.get(clave)
+        return 0.0 if entrada is None else entrada[0]
+
+    def cantidad(self) -> int:
+        return len(self.__entradas)
+
+    def completados(self) -> int:
+        return self.__completados
+
+    def promedio(self) -> float:
+        if not self.__entradas:
+            return 0.0
+        return self.__suma / len(self.__entradas)
@@ -70,13 +70,18 @@ class Actividad:
         print(f"Nombre actualizado de '{valor_anterior}' a '{self.__nombre}'.")
 
     def actualizar_duracion(self, nueva_duracion: int):
+        valor_anterior = self.__duracion_min
+        self._cambiar_duracion(nueva_duracion)
+        print(f"Duración mínima actualizada de {valor_anterior} a {self.__duracion_min} minutos.")
+
+    def _cambiar_duracion(self, nueva_duracion: int):
+        # Valida, cambia y registra en el historial sin imprimir (lo usan actualizar_duracion y los puntos de control de Carrera)
         if nueva_duracion < 1:
             raise ValueError("La duración mínima aceptada es 1 minuto.")
-        
+
         valor_anterior = self.__duracion_min
         self.__duracion_min = nueva_duracion
         self.__registrar_evento("duracion_min", valor_anterior, self.__duracion_min)
-        print(f"Duración mínima actualizada de {valor_anterior} a {self.__duracion_min} minutos.")
     
     def __str__(self):
         return f"Actividad {self.__nombre} (ID: {self.__id_actividad}, Nombre: {self.__nombre}, Duraciónmínima: {self.__duracion_min} minutos)"
\ No newline at end of file
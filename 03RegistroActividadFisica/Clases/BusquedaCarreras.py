@@ -0,0 +1,209 @@
+# Búsqueda de carreras parecidas por (distancia_km, duracion_min, ritmo) con un índice de grilla.
+# Datos
+    # • escalas: cuánto vale "1" en cada eje (por defecto 1 km, 5 min y 0,25 min/km); la distancia entre carreras se mide
+    #   con esos ejes ya divididos por su escala, así ninguno pesa más solo por sus unidades.
+    # • grilla: celda (enteros) → claves de las carreras que caen ahí; cada celda mide 1 en cada eje escalado.
+    # • por clave: sus valores escalados, su celda y el objeto que se devuelve (la Carrera, o la clave si vino de un registro).
+# Operaciones
+    # • seguir(carrera) / dejar_de_seguir(carrera) / cerrar() → igual que EstadisticasEntrenamiento; al cambiar una
+    #   carrera solo se mueve de celda si hace falta.
+    # • desde_registro(registro, escalas) → arma el índice de una vez desde un RegistroEntrenamiento (NumPy).
+    # • vecinos(distancia_km, duracion_min, k) → las k más cercanas, buscando por anillos de celdas alrededor del punto.
+    # • similares(carrera, k) → igual, sin contar la misma carrera.
+    # • rango(distancia_km=(min, max), duracion_min=(min, max), ritmo=(min, max)) → las que caen en todos los rangos.
+# Reglas de negocio
+    # • El ritmo es duracion_min / distancia_km (redondeado a 2 decimales, igual que calcular_ritmo()).
+    # • vecinos() se detiene apenas ningún anillo más lejano puede tener algo más cerca que el k-ésimo encontrado.
+"""---------------------------------------------------------------------------------------------------------------------------------------------------------------------"""
+import heapq
+import itertools
+import math
+
+import numpy as np
+
+from Clases.Carrera import Carrera
+
+ESCALAS = (1.0, 5.0, 0.25) # km, minutos, min/km
+
+
+class BusquedaCarreras:
+
+    def __init__(self, carreras=(), seguir_nuevas: bool = False, escalas: tuple = ESCALAS):
+        if len(escalas) != 3 or any(e <= 0 for e in escalas):
+            raise ValueError("Las escalas deben ser tres valores mayores a 0 (km, minutos, min/km).")
+
+        self.__escalas = tuple(float(e) for e in escalas)
+        self.__celdas = {}    # celda → set de claves
+        self.__puntos = {}    # clave → (valores escalados, celda)
+        self.__objetos = {}   # clave → objeto que se devuelve
+        self.__minimos = [math.inf] * 3   # celda mínima y máxima usada en cada eje (no se achican al quitar)
+        self.__maximos = [-math.inf] * 3
+        self.__seguir_nuevas = seguir_nuevas
+        for carrera in carreras:
+            self.seguir(carrera)
+        Carrera.suscribir(self.__al_cambiar)
+
+    def __len__(self):
+        return len(self.__puntos)
+
+    """ Métodos----------------------------------------------------------------------------------------------------------------------------------------------------------"""
+    def __escalar(self, distancia_km: float, duracion_min: float) -> tuple:
+        ritmo = round(duracion_min / distancia_km, 2)
+        return (distancia_km / self.__escalas[0], duracion_min / self.__escalas[1], ritmo / self.__escalas[2])
+
+    @staticmethod
+    def __celda_de(punto: tuple) -> tuple:
+        return tuple(math.floor(v) for v in punto)
+
+    def __poner(self, clave, punto: tuple, celda: tuple):
+        anterior = self.__puntos.get(clave)
+        if anterior is not None and anterior[1] != celda: # solo se mueve si cambió de celda
+            self.__quitar_de_celda(clave, anterior[1])
+        self.__puntos[clave] = (punto, celda)
+        self.__celdas.setdefault(celda, set()).add(clave)
+        self.__ampliar_limites(celda, celda)
+
+    def __ampliar_limites(self, minimos, maximos):
+        for eje in range(3):
+            self.__minimos[eje] = min(self.__minimos[eje], minimos[eje])
+            self.__maximos[eje] = max(self.__maximos[eje], maximos[eje])
+
+    def __quitar_de_celda(self, clave, celda: tuple):
+        claves = self.__celdas[celda]
+        claves.discard(clave)
+        if not claves:
+            del self.__celdas[celda]
+
+    def seguir(self, carrera):
+        if carrera.id_actividad in self.__puntos:
+            return
+        punto = self.__escalar(carrera.distancia_km, carrera.duracion_min)
+        self.__objetos[carrera.id_actividad] = carrera
+        self.__poner(carrera.id_actividad, punto, self.__celda_de(punto))
+
+    def dejar_de_seguir(self, carrera):
+        anterior = self.__puntos.pop(carrera.id_actividad, None)
+        if anterior is not None:
+            self.__quitar_de_celda(carrera.id_actividad, anterior[1])
+            del self.__objetos[carrera.id_actividad]
+
+    def cerrar(self):
+        Carrera.desuscribir(self.__al_cambiar)
+
+    def __al_cambiar(self, evento: str, carrera, anterior):
+        if evento == "creacion":
+            if self.__seguir_nuevas:
+                self.seguir(carrera)
+        elif carrera.id_actividad in self.__puntos:
+            punto = self.__escalar(carrera.distancia_km, carrera.duracion_min)
+            self.__poner(carrera.id_actividad, punto, self.__celda_de(punto))
+
+    @classmethod
+    def desde_registro(cls, registro, escalas: tuple = ESCALAS):
+        # Las celdas se calculan para todas las filas a la vez y se agrupan con un solo ordenamiento; no se suscribe a Carrera
+        indice = cls(escalas=escalas)
+        indice.cerrar()
+        if len(registro) == 0:
+            return indice
+        puntos = np.column_stack((registro.distancia_km, registro.duracion_min, registro.ritmos())) / np.array(indice.__escalas)
+        celdas = np.floor(puntos).astype(np.int64)
+        claves = [i if clave is None else clave for i, clave in enumerate(registro.ids)] # sin id se usa la fila
+
+        # Cada celda se codifica en un solo entero para ordenar una vez (más rápido que ordenar filas de 3 columnas)
+        minimos = celdas.min(axis=0)
+        tamanios = celdas.max(axis=0) - minimos + 1
+        codigos = ((celdas[:, 0] - minimos[0]) * tamanios[1] + (celdas[:, 1] - minimos[1])) * tamanios[2] + (celdas[:, 2] - minimos[2])
+        orden = np.argsort(codigos, kind="stable")
+        ordenados = codigos[orden]
+        inicios = np.flatnonzero(np.r_[True, ordenados[1:] != ordenados[:-1]])
+        fines = np.r_[inicios[1:], len(orden)].tolist()
+        filas_ordenadas = orden.tolist()
+        for inicio, fin, fila in zip(inicios.tolist(), fines, orden[inicios].tolist()):
+            indice.__celdas[tuple(celdas[fila].tolist())] = {claves[f] for f in filas_ordenadas[inicio:fin]}
+        for clave, punto, celda in zip(claves, map(tuple, puntos.tolist()), map(tuple, celdas.tolist())):
+            indice.__puntos[clave] = (punto, celda)
+            indice.__objetos[clave] = clave
+        indice.__ampliar_limites(minimos.tolist(), (minimos + tamanios - 1).tolist())
+        return indice
+
+    def __anillo(self, centro: tuple, radio: int):
+        # Celdas ocupadas a distancia de Chebyshev exactamente "radio" del centro
+        cantidad_anillo = (2 * radio + 1) ** 3 - max(0, 2 * radio - 1) ** 3
+        if cantidad_anillo > len(self.__celdas): # anillo grande y grilla dispersa: conviene mirar solo las ocupadas
+            for celda, claves in self.__celdas.items():
+                if max(abs(c - o) for c, o in zip(celda, centro)) == radio:
+                    yield claves
+            return
+        for desplazamiento in itertools.product(range(-radio, radio + 1), repeat=3):
+            if max(abs(d) for d in desplazamiento) != radio:
+                continue
+            claves = self.__celdas.get(tuple(c + d for c, d in zip(centro, desplazamiento)))
+            if claves:
+                yield claves
+
+    def __vecinos(self, punto: tuple, k: int, excluir=None) -> list:
+        if k <= 0:
+            raise ValueError("k debe ser mayor a 0.")
+        if not self.__celdas:
+            return []
+        centro = self.__celda_de(punto)
+        # Más allá de este radio ya no hay celdas ocupadas
+        radio_maximo = max(max(c - minimo, maximo - c) for c, minimo, maximo in zip(centro, self.__minimos, self.__maximos))
+        mejores = [] # heap de (-distancia, orden, clave): el tope es el peor de los k
+        orden = itertools.count() # desempate, así nunca se comparan claves de distinto tipo
+        radio = 0
+        while True:
+            for claves in self.__anillo(centro, radio):
+                for clave in claves:
+                    if clave == excluir:
+                        continue
+                    distancia = math.dist(punto, self.__puntos[clave][0])
+                    if len(mejores) < k:
+                        heapq.heappush(mejores, (-distancia, next(orden), clave))
+                    elif distancia < -mejores[0][0]:
+                        heapq.heapreplace(mejores, (-distancia, next(orden), clave))
+            # Todo lo que está en anillos más lejanos queda al menos a "radio" de distancia
+            if len(mejores) == k and -mejores[0][0] <= radio:
+                break
+            if radio >= radio_maximo:
+                break
+            radio += 1
+        return [(self.__objetos[clave], -menos) for menos, _, clave in sorted(mejores, key=lambda e: (-e[0], e[1]))]
+
+    def vecinos(self, distancia_km: float, duracion_min: float, k: int = 5) -> list:
+        # [(carrera o clave, distancia escalada), ...] de la más parecida a la menos
+        if distancia_km <= 0:
+            raise Exception("La distancia debe ser positiva (mayor que 0)")
+        return self.__vecinos(self.__escalar(distancia_km, duracion_min), k)
+
+    def similares(self, carrera, k: int = 5) -> list:
+        return self.__vecinos(self.__escalar(carrera.distancia_km, carrera.duracion_min), k, carrera.id_actividad)
+
+    def rango(self, distancia_km: tuple = None, duracion_min: tuple = None, ritmo: tuple = None) -> list:
+        limites = []
+        for limite, escala in zip((distancia_km, duracion_min, ritmo), self.__escalas):
+            if limite is None:
+                limites.append((-math.inf, math.inf))
+            else:
+                if limite[0] > limite[1]:
+                    raise ValueError("El mínimo de un rango no puede ser mayor que su máximo.")
+                limites.append((limite[0] / escala, limite[1] / escala))
+
+        # Se recorren las celdas del rango si son pocas; si no, las ocupadas descartando las que quedan fuera
+        cantidad = 1
+        for minimo, maximo in limites:
+            cantidad *= math.inf if math.isinf(maximo - minimo) else math.floor(maximo) - math.floor(minimo) + 1
+        if cantidad <= len(self.__celdas):
+            celdas = itertools.product(*(range(math.floor(minimo), math.floor(maximo) + 1) for minimo, maximo in limites))
+            grupos = (self.__celdas.get(celda, ()) for celda in celdas)
+        else:
+            grupos = (claves for celda, claves in self.__celdas.items()
+                      if all(c + 1 > minimo and c <= maximo for c, (minimo, maximo) in zip(celda, limites))) # [c, c+1) toca el rango
+
+        resultado = []
+        for claves in grupos:
+            for clave in claves:
+                punto = self.__puntos[clave][0]
+                if all(minimo <= v <= maximo for v, (minimo, maximo) in zip(punto, limites)):
+                    resultado.append(self.__objetos[clave])
+        return resultado
@@ -2,6 +2,8 @@
 # Datos adicionales
     # distancia_km (decimal > 0). OK
     # eventos_registro (solo lectura: fecha, distancia registrada, duración acumulada). OK
+    # En una carrera leída de un recorrido GPS (LectorRecorrido), eventos_registro empieza con un registro por parcial
+    # (km acumulados, minutos acumulados con 2 decimales, fecha/hora del recorrido) y termina con el total.
 # Operaciones
     # registrar_distancia(nueva_distancia) → valida > 0.
     # calcular_ritmo() → devuelve minutos por km (duracion_min / distancia_km).
@@ -10,14 +12,24 @@
     # Ritmo solo puede calcularse si existe una distancia registrada válida.
     # Ni la distancia ni la duración pueden editarse directamente; solo mediante operaciones.
     # Cada registro de distancia queda en eventos_registro con fecha/hora.
+# Suscripciones
+    # Carrera.suscribir(funcion) → funcion(evento, carrera, anterior) se llama al crear una carrera ("creacion") y
+    # después de registrar_distancia ("distancia"), actualizar_duracion ("duracion") o de un punto de control de una
+    # sesión en vivo ("punto_control").
+    # anterior es (distancia_km, duracion_min) antes del cambio, o None en la creación.
+# Sesión en vivo
+    # sesion_en_vivo(resolucion_km, resolucion_min) → SesionEnVivo: recibe muestras cada segundo y solo escribe en los
+    # historiales cada tanto (puntos de control), sin imprimir.
 
 """---------------------------------------------------------------------------------------------------------------------------------------------------------------------"""
 
 from Clases.Actividad import Actividad
-from datetime import datetime
+from datetime import datetime, timedelta
 
 class Carrera(Actividad):
 
+    _suscriptores = [] #atributo de clase: funciones que se avisan en cada cambio de cualquier carrera
+
     def __init__(self, nombre: str, duracion_min: int, distancia_km: float):
         super().__init__(nombre, duracion_min)
         
@@ -29,6 +41,7 @@ class Carrera(Actividad):
         self.__eventos_registro = []
 
         self._registrar_distancia_interna(distancia_km, duracion_min)
+        self.__notificar("creacion", None)
         print(f"Carrera '{self.nombre}' creada con distancia de {self.distancia_km} km y duración mínima de {self.duracion_min} minutos")
 
     """ Getters----------------------------------------------------------------------------------------------------------------------------------------------------------"""
@@ -43,33 +56,81 @@ class Carrera(Actividad):
     
     """ Métodos----------------------------------------------------------------------------------------------------------------------------------------------------------"""
 
+    @staticmethod
+    def suscribir(funcion):
+        Carrera._suscriptores.append(funcion)
+
+    @staticmethod
+    def desuscribir(funcion):
+        if funcion in Carrera._suscriptores:
+            Carrera._suscriptores.remove(funcion)
+
+    def __notificar(self, evento: str, anterior):
+        for funcion in Carrera._suscriptores:
+            funcion(evento, self, anterior)
+
     def actualizar_duracion(self, nueva_duracion: int):
+        anterior = (self.__distancia_km, self.duracion_min)
         super().actualizar_duracion(nueva_duracion) # Llama al método padre para validar y registrar el cambio
         # Registra el nuevo punto de control en eventos_registro con la distancia actual
         self._registrar_distancia_interna(self.__distancia_km, nueva_duracion)
+        self.__notificar("duracion", anterior)
         print(f"Duración actualizada a {nueva_duracion} minutos para la carrera {self.nombre}")
     
-    def _registrar_distancia_interna(self, distancia: float, duracion: int):
+    def _registrar_distancia_interna(self, distancia: float, duracion: int, fecha: datetime = None):
         registro = {
-            "fecha": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "fecha": (fecha or datetime.now()).strftime("%Y-%m-%d %H:%M:%S"),
             "distancia_registrada": distancia,
             "duracion_acumulada": duracion
         }
         self.__eventos_registro.append(registro)
 
+    def _registrar_parciales(self, parciales: list, inicio: datetime):
+        # Lo usa LectorRecorrido justo después de crear la carrera: cada parcial (km, minutos acumulados) pasa por
+        # _registrar_distancia_interna con la hora del recorrido, antes del registro total de la creación
+        if len(self.__eventos_registro) != 1:
+            raise Exception("Los parciales solo se pueden registrar en una carrera recién creada.")
+        total = self.__eventos_registro.pop()
+        for km, minutos in parciales:
+            self._registrar_distancia_interna(km, minutos, inicio + timedelta(minutes=minutos))
+        self._registrar_distancia_interna(total["distancia_registrada"], total["duracion_acumulada"],
+                                          inicio + timedelta(minutes=total["duracion_acumulada"]))
+
+    def _registrar_punto_control(self, distancia: float, duracion: int):
+        # Lo usa SesionEnVivo: cambia distancia y duración juntas y deja un solo registro en cada historial, sin imprimir
+        if distancia <= 0:
+            raise ValueError("La nueva distancia debe ser positiva")
+        if duracion < 1:
+            raise ValueError("La duración mínima aceptada es 1 minuto.")
+
+        anterior = (self.__distancia_km, self.duracion_min)
+        self.__distancia_km = distancia
+        if anterior[0] != distancia:
+            self._Actividad__registrar_evento("distancia_km", anterior[0], distancia)
+        if anterior[1] != duracion:
+            self._cambiar_duracion(duracion)
+        self._registrar_distancia_interna(distancia, duracion)
+        self.__notificar("punto_control", anterior)
+
+    def sesion_en_vivo(self, resolucion_km: float = 1.0, resolucion_min: float = None, ventana_seg: float = 30):
+        from Clases.SesionEnVivo import SesionEnVivo # aquí para no importar en círculo
+        return SesionEnVivo(self, resolucion_km, resolucion_min, ventana_seg)
+
     def registrar_distancia(self, nueva_distancia: float):
         if nueva_distancia <= 0:
             raise ValueError("La nueva distancia debe ser positiva")
             
         valor_anterior = self.__distancia_km
+        anterior = (valor_anterior, self.duracion_min)
         self.__distancia_km = nueva_distancia
         print(f"Distancia actualizada de {valor_anterior} km a {self.__distancia_km} km para la carrera {self.nombre}")
         
         # Se registra en el historial de la actividad el cambio de distancia
-        self._registrar_evento("distancia_km", valor_anterior, self.__distancia_km)
+        self._Actividad__registrar_evento("distancia_km", valor_anterior, self.__distancia_km)
         
         # Se agrega un nuevo registro en eventos_registro con la nueva distancia y la duración actual
         self._registrar_distancia_interna(self.__distancia_km, self.duracion_min)
+        self.__notificar("distancia", anterior)
         
 
     def calcular_ritmo(self) -> float:
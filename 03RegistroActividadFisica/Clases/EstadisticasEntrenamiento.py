@@ -0,0 +1,116 @@
+# Estadísticas de entrenamiento por semana que se mantienen al día con cada cambio de Carrera (sin recorrer el historial).
+# Datos
+    # • por semana (lunes): distancia_km, duracion_min y cantidad de carreras.
+    # • por carrera seguida: su semana y lo que aportó (distancia, duración), para poder descontarlo si cambia.
+# Operaciones
+    # • seguir(carrera, fecha) → empieza a contar una carrera ya creada; con seguir_nuevas=True se cuentan solas al crearse.
+    # • dejar_de_seguir(carrera) / cerrar() → descuenta la carrera / deja de escuchar a Carrera.
+    # • semana(fecha) → totales de la semana de esa fecha.
+    # • ritmo_promedio(fecha, semanas=4) → min/km de las últimas semanas (minutos totales / km totales).
+    # • carga_aguda(fecha), carga_cronica(fecha), relacion_carga(fecha) → carga de la última semana, promedio semanal de
+    #   las últimas 4 y la relación aguda/crónica.
+# Reglas de negocio
+    # • Cada carrera cuenta en la semana en que se creó (primer evento de historial_eventos).
+    # • La carga es el tiempo de entrenamiento (duracion_min).
+    # • Cada cambio (registrar_distancia / actualizar_duracion) resta lo viejo y suma lo nuevo en una sola semana: O(1).
+    # • Las consultas leen solo las semanas de la ventana (4 por defecto), no todo el historial.
+"""---------------------------------------------------------------------------------------------------------------------------------------------------------------------"""
+from datetime import date, datetime, timedelta
+
+from Clases.Carrera import Carrera
+
+
+def lunes_de(fecha) -> date:
+    if isinstance(fecha, str):
+        fecha = datetime.strptime(fecha, "%Y-%m-%d %H:%M:%S")
+    if isinstance(fecha, datetime):
+        fecha = fecha.date()
+    return fecha - timedelta(days=fecha.weekday())
+
+
+class EstadisticasEntrenamiento:
+
+    def __init__(self, carreras=(), seguir_nuevas: bool = False):
+        self.__semanas = {}   # lunes → [distancia_km, duracion_min, carreras]
+        self.__aportes = {}   # id_actividad → (lunes, distancia_km, duracion_min)
+        self.__seguir_nuevas = seguir_nuevas
+        for carrera in carreras:
+            self.seguir(carrera)
+        Carrera.suscribir(self.__al_cambiar)
+
+    def __len__(self):
+        return len(self.__aportes)
+
+    """ Métodos----------------------------------------------------------------------------------------------------------------------------------------------------------"""
+    def __sumar(self, lunes: date, distancia: float, duracion: int, carreras: int):
+        totales = self.__semanas.get(lunes)
+        if totales is None:
+            totales = self.__semanas[lunes] = [0.0, 0, 0]
+        totales[0] += distancia
+        totales[1] += duracion
+        totales[2] += carreras
+        if totales[2] == 0: # la semana quedó sin carreras
+            del self.__semanas[lunes]
+
+    def seguir(self, carrera, fecha=None):
+        if carrera.id_actividad in self.__aportes:
+            return
+        lunes = lunes_de(fecha if fecha is not None else carrera.historial_eventos[0]["fecha"])
+        self.__aportes[carrera.id_actividad] = (lunes, carrera.distancia_km, carrera.duracion_min)
+        self.__sumar(lunes, carrera.distancia_km, carrera.duracion_min, 1)
+
+    def dejar_de_seguir(self, carrera):
+        aporte = self.__aportes.pop(carrera.id_actividad, None)
+        if aporte is not None:
+            self.__sumar(aporte[0], -aporte[1], -aporte[2], -1)
+
+    def cerrar(self):
+        Carrera.desuscribir(self.__al_cambiar)
+
+    def __al_cambiar(self, evento: str, carrera, anterior):
+        if evento == "creacion":
+            if self.__seguir_nuevas:
+                self.seguir(carrera, datetime.now())
+            return
+
+        aporte = self.__aportes.get(carrera.id_actividad)
+        if aporte is None: # no es una carrera que se esté siguiendo
+            return
+        lunes, distancia, duracion = aporte
+        self.__aportes[carrera.id_actividad] = (lunes, carrera.distancia_km, carrera.duracion_min)
+        self.__sumar(lunes, carrera.distancia_km - distancia, carrera.duracion_min - duracion, 0)
+
+    def semana(self, fecha=None) -> dict:
+        lunes = lunes_de(fecha if fecha is not None else date.today())
+        distancia, duracion, carreras = self.__semanas.get(lunes, (0.0, 0, 0))
+        return {"semana": lunes, "distancia_km": distancia, "duracion_min": duracion, "carreras": carreras}
+
+    def __ventana(self, fecha, semanas: int) -> tuple:
+        if semanas <= 0:
+            raise ValueError("La cantidad de semanas debe ser mayor a 0.")
+        lunes = lunes_de(fecha if fecha is not None else date.today())
+        distancia = duracion = 0
+        for i in range(semanas):
+            totales = self.__semanas.get(lunes - timedelta(weeks=i))
+            if totales is not None:
+                distancia += totales[0]
+                duracion += totales[1]
+        return distancia, duracion
+
+    def ritmo_promedio(self, fecha=None, semanas: int = 4) -> float:
+        distancia, duracion = self.__ventana(fecha, semanas)
+        if distancia <= 0:
+            raise Exception("No se puede calcular el ritmo sin una distancia registrada válida (> 0).")
+        return round(duracion / distancia, 2)
+
+    def carga_aguda(self, fecha=None) -> float:
+        return float(self.__ventana(fecha, 1)[1])
+
+    def carga_cronica(self, fecha=None, semanas: int = 4) -> float:
+        return self.__ventana(fecha, semanas)[1] / semanas
+
+    def relacion_carga(self, fecha=None, semanas: int = 4) -> float:
+        cronica = self.carga_cronica(fecha, semanas)
+        if cronica == 0:
+            raise Exception("No hay carga crónica registrada para calcular la relación aguda/crónica.")
+        return round(self.carga_aguda(fecha) / cronica, 2)
@@ -0,0 +1,163 @@
+# Lectura de recorridos GPS (GPX o CSV) para crear una Carrera con sus parciales por kilómetro.
+# Archivo
+    # • GPX: puntos <trkpt lat lon> con <time>; el nombre sale de <trk><name> o, si no hay, del nombre del archivo.
+    # • CSV: columnas lat, lon y time (fecha ISO, ej: 2024-05-01T07:30:00Z).
+# Operaciones
+    # • leer_puntos(ruta) → generador de (lat, lon, tiempo); el archivo se recorre una sola vez y no se guarda entero.
+    # • resumir_puntos(puntos, largo_parcial_km) → distancia total, duración y parciales, en una pasada.
+    # • carrera_desde_recorrido(ruta, nombre) → Carrera creada con la distancia y duración del recorrido; cada parcial
+    #   (km acumulados, minutos acumulados con decimales) entra a eventos_registro por _registrar_distancia_interna,
+    #   con la hora del recorrido y en orden, antes del registro total.
+    # • cargar_recorridos(rutas, procesos, rechazo) → muchos archivos en paralelo (ProcessPoolExecutor).
+# Reglas de negocio
+    # • La distancia entre puntos se calcula con la fórmula de haversine.
+    # • El GPX se lee con iterparse y cada <trkpt> se saca de su <trkseg> apenas se usa: la memoria no crece con los puntos.
+    # • Las horas con zona (ej: "Z") se pasan a la hora local antes de registrarlas en la Carrera.
+    # • La duración de la Carrera es en minutos enteros (≥ 1, como pide Actividad): max(1, round(minutos)).
+    # • El minuto de cada parcial se interpola entre los dos puntos donde se cruza el kilómetro.
+    # • Un recorrido sin distancia o sin horas no puede ser Carrera: se informa a rechazo(ruta, motivo).
+    # • Crear la Carrera no imprime nada, ni con carrera_desde_recorrido ni con cargar_recorridos.
+"""---------------------------------------------------------------------------------------------------------------------------------------------------------------------"""
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import csv
+from datetime import datetime
+import math
+import os
+import xml.etree.ElementTree as ET
+
+from Clases.Carrera import Carrera
+
+RADIO_TIERRA_KM = 6371.0088
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    fi1, fi2 = math.radians(lat1), math.radians(lat2)
+    d_fi = fi2 - fi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_fi / 2) ** 2 + math.cos(fi1) * math.cos(fi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * RADIO_TIERRA_KM * math.asin(math.sqrt(a))
+
+
+def _leer_tiempo(texto):
+    if not texto:
+        return None
+    return datetime.fromisoformat(texto.strip().replace("Z", "+00:00"))
+
+
+def _sin_espacio(etiqueta: str) -> str:
+    return etiqueta.rsplit("}", 1)[-1] # "{http://www.topografix.com/GPX/1/1}trkpt" → "trkpt"
+
+
+def _leer_gpx(ruta: str, nombre: list):
+    # nombre: lista de un elemento donde se deja el <trk><name> apenas aparece
+    # camino: elementos abiertos (el último es el padre del que se cierra), para poder sacar los ya usados
+    camino = []
+    for evento, elemento in ET.iterparse(ruta, events=("start", "end")):
+        if evento == "start":
+            camino.append(elemento)
+            continue
+        camino.pop()
+        etiqueta = _sin_espacio(elemento.tag)
+        if etiqueta == "trkpt":
+            tiempo = None
+            for hijo in elemento:
+                if _sin_espacio(hijo.tag) == "time":
+                    tiempo = _leer_tiempo(hijo.text)
+            yield float(elemento.get("lat")), float(elemento.get("lon")), tiempo
+            if camino:
+                camino[-1].remove(elemento) # el punto ya se usó: se saca del <trkseg>, no solo se vacía
+        elif etiqueta == "trkseg":
+            if camino:
+                camino[-1].remove(elemento)
+        elif etiqueta == "name" and camino and _sin_espacio(camino[-1].tag) == "trk" and nombre[0] is None:
+            nombre[0] = (elemento.text or "").strip() or None
+
+
+def _leer_csv(ruta: str):
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        for fila in csv.DictReader(archivo):
+            yield float(fila["lat"]), float(fila["lon"]), _leer_tiempo(fila.get("time"))
+
+
+def leer_puntos(ruta: str, nombre: list = None):
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".gpx":
+        return _leer_gpx(ruta, nombre if nombre is not None else [None])
+    if extension == ".csv":
+        return _leer_csv(ruta)
+    raise ValueError(f"Formato de archivo no soportado: '{extension}'. Use .gpx o .csv.")
+
+
+def resumir_puntos(puntos, largo_parcial_km: float = 1.0) -> tuple:
+    # Una sola pasada; solo se guarda el punto anterior y la lista de parciales (uno por km, no por punto)
+    # Devuelve (distancia_km, minutos, [(km, minutos_acumulados), ...], hora del primer punto)
+    if largo_parcial_km <= 0:
+        raise ValueError("El largo del parcial debe ser mayor a 0.")
+
+    distancia = 0.0
+    inicio = anterior = None
+    minutos_anterior = 0.0
+    parciales = []
+    siguiente_parcial = largo_parcial_km
+    for lat, lon, tiempo in puntos:
+        if tiempo is None:
+            raise ValueError("El recorrido tiene puntos sin hora; no se puede calcular la duración.")
+        if anterior is None:
+            inicio = tiempo
+            anterior = (lat, lon)
+            continue
+
+        tramo = haversine(anterior[0], anterior[1], lat, lon)
+        minutos = (tiempo - inicio).total_seconds() / 60
+        while tramo > 0 and distancia + tramo >= siguiente_parcial:
+            fraccion = (siguiente_parcial - distancia) / tramo
+            parciales.append((round(siguiente_parcial, 3), round(minutos_anterior + fraccion * (minutos - minutos_anterior), 2)))
+            siguiente_parcial += largo_parcial_km
+        distancia += tramo
+        anterior = (lat, lon)
+        minutos_anterior = minutos
+
+    if anterior is None:
+        raise ValueError("El recorrido no tiene puntos.")
+    return distancia, minutos_anterior, parciales, inicio
+
+
+def _resumir_archivo(ruta: str, largo_parcial_km: float = 1.0) -> tuple:
+    # Corre en los procesos del pool: devuelve solo datos (tuplas), la Carrera se crea en el proceso principal
+    nombre = [None]
+    distancia, minutos, parciales, inicio = resumir_puntos(leer_puntos(ruta, nombre), largo_parcial_km)
+    if nombre[0] is None:
+        nombre[0] = os.path.splitext(os.path.basename(ruta))[0]
+    return nombre[0], distancia, minutos, parciales, inicio
+
+
+def _crear_carrera(nombre: str, distancia: float, minutos: float, parciales: list, inicio: datetime) -> Carrera:
+    if distancia <= 0:
+        raise Exception("La distancia debe ser positiva (mayor que 0)")
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo): # el constructor imprime un mensaje
+        carrera = Carrera(nombre, max(1, round(minutos)), round(distancia, 3))
+    if inicio.tzinfo is not None:
+        inicio = inicio.astimezone().replace(tzinfo=None) # eventos_registro usa la hora local, como datetime.now()
+    carrera._registrar_parciales(parciales, inicio)
+    return carrera
+
+
+def carrera_desde_recorrido(ruta: str, nombre: str = None, largo_parcial_km: float = 1.0) -> Carrera:
+    nombre_archivo, distancia, minutos, parciales, inicio = _resumir_archivo(ruta, largo_parcial_km)
+    return _crear_carrera(nombre or nombre_archivo, distancia, minutos, parciales, inicio)
+
+
+def cargar_recorridos(rutas, procesos: int = None, largo_parcial_km: float = 1.0, rechazo=None):
+    # Generador de Carrera en el mismo orden de rutas; los archivos con error se informan y se saltan
+    rutas = list(rutas)
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        futuros = [pool.submit(_resumir_archivo, ruta, largo_parcial_km) for ruta in rutas]
+        for ruta, futuro in zip(rutas, futuros):
+            try:
+                carrera = _crear_carrera(*futuro.result())
+            except Exception as e:
+                if rechazo is not None:
+                    rechazo(ruta, str(e))
+                continue
+            yield carrera
@@ -0,0 +1,117 @@
+# Récords personales (mejor ritmo) por banda de distancia, al día con cada cambio de Carrera.
+# Datos
+    # • BANDAS: 5K [5, 10), 10K [10, 21.0975), media [21.0975, 42.195), maraton [42.195, ∞) en km.
+    # • un heap por banda con (ritmo, version, id_actividad): el primero es el récord.
+    # • por carrera seguida: su banda, ritmo y versión vigentes.
+# Operaciones
+    # • seguir(carrera) / dejar_de_seguir(carrera) / cerrar() → igual que EstadisticasEntrenamiento.
+    # • record(banda) → (carrera, ritmo) del récord de esa banda o None, en O(1).
+    # • records() → {banda: (carrera, ritmo) o None}.
+# Reglas de negocio
+    # • El ritmo es el de calcular_ritmo() (min/km, 2 decimales); a igual ritmo queda el que se registró o cambió primero.
+    # • Las carreras de menos de 5 km no entran en ninguna banda.
+    # • Al cambiar una carrera no se busca su entrada vieja en el heap: se agrega una nueva y la vieja queda "vencida"
+    #   (otra versión). Las vencidas se sacan cuando llegan al tope, así el tope siempre es un récord válido (aunque el
+    #   récord empeore o la carrera cambie de banda). Actualizar cuesta O(log n).
+"""---------------------------------------------------------------------------------------------------------------------------------------------------------------------"""
+import heapq
+import itertools
+
+from Clases.Carrera import Carrera
+
+BANDAS = (
+    ("5K", 5.0, 10.0),
+    ("10K", 10.0, 21.0975),
+    ("media", 21.0975, 42.195),
+    ("maraton", 42.195, float("inf")),
+)
+
+
+def banda_de(distancia_km: float):
+    for nombre, desde, hasta in BANDAS:
+        if desde <= distancia_km < hasta:
+            return nombre
+    return None
+
+
+class RecordsPersonales:
+
+    def __init__(self, carreras=(), seguir_nuevas: bool = False):
+        self.__heaps = {nombre: [] for nombre, _, _ in BANDAS}
+        self.__vigentes = {}   # id_actividad → (banda, ritmo, version)
+        self.__validas = {nombre: 0 for nombre, _, _ in BANDAS} # entradas vigentes en cada heap
+        self.__carreras = {}   # id_actividad → carrera
+        self.__orden = itertools.count() # desempate y número de versión
+        self.__seguir_nuevas = seguir_nuevas
+        for carrera in carreras:
+            self.seguir(carrera)
+        Carrera.suscribir(self.__al_cambiar)
+
+    def __len__(self):
+        return len(self.__carreras)
+
+    """ Métodos----------------------------------------------------------------------------------------------------------------------------------------------------------"""
+    def __vencida(self, entrada: tuple) -> bool:
+        vigente = self.__vigentes.get(entrada[2])
+        return vigente is None or vigente[2] != entrada[1]
+
+    def __limpiar(self, banda: str):
+        heap = self.__heaps[banda]
+        while heap and self.__vencida(heap[0]):
+            heapq.heappop(heap)
+        # Si las vencidas pasan a ser mayoría, se rehace el heap una vez (costo repartido entre muchas actualizaciones)
+        if len(heap) > 32 and len(heap) > 2 * self.__validas[banda]:
+            heap[:] = [entrada for entrada in heap if not self.__vencida(entrada)]
+            heapq.heapify(heap)
+
+    def __ubicar(self, carrera):
+        # Registra el estado actual de la carrera y limpia la banda vieja y la nueva
+        anterior = self.__vigentes.pop(carrera.id_actividad, None)
+        if anterior is not None:
+            self.__validas[anterior[0]] -= 1
+        banda = banda_de(carrera.distancia_km)
+        if banda is not None:
+            self.__validas[banda] += 1
+            ritmo = carrera.calcular_ritmo()
+            version = next(self.__orden)
+            self.__vigentes[carrera.id_actividad] = (banda, ritmo, version)
+            heapq.heappush(self.__heaps[banda], (ritmo, version, carrera.id_actividad))
+            self.__limpiar(banda)
+        if anterior is not None and anterior[0] != banda:
+            self.__limpiar(anterior[0])
+
+    def seguir(self, carrera):
+        if carrera.id_actividad in self.__carreras:
+            return
+        self.__carreras[carrera.id_actividad] = carrera
+        self.__ubicar(carrera)
+
+    def dejar_de_seguir(self, carrera):
+        if self.__carreras.pop(carrera.id_actividad, None) is None:
+            return
+        anterior = self.__vigentes.pop(carrera.id_actividad, None)
+        if anterior is not None:
+            self.__validas[anterior[0]] -= 1
+            self.__limpiar(anterior[0])
+
+    def cerrar(self):
+        Carrera.desuscribir(self.__al_cambiar)
+
+    def __al_cambiar(self, evento: str, carrera, anterior):
+        if evento == "creacion":
+            if self.__seguir_nuevas:
+                self.seguir(carrera)
+        elif carrera.id_actividad in self.__carreras:
+            self.__ubicar(carrera)
+
+    def record(self, banda: str):
+        if banda not in self.__heaps:
+            raise ValueError(f"Banda de distancia inválida: '{banda}'. Use {', '.join(self.__heaps)}.")
+        heap = self.__heaps[banda]
+        if not heap:
+            return None
+        ritmo, _, id_actividad = heap[0] # el tope nunca está vencido
+        return self.__carreras[id_actividad], ritmo
+
+    def records(self) -> dict:
+        return {banda: self.record(banda) for banda in self.__heaps}
@@ -0,0 +1,149 @@
+# Registro de entrenamiento en columnas (NumPy) para analizar muchas carreras a la vez.
+# Datos
+    # • duracion_min, distancia_km y fecha de cada carrera, cada uno en su propio arreglo (una posición por carrera).
+    # • ids opcionales (id_actividad de la Carrera de origen).
+# Operaciones
+    # • RegistroEntrenamiento(duraciones, distancias, fechas, ids) → carga directa desde arreglos.
+    # • desde_carreras(carreras) → arma las columnas desde objetos Carrera ya creados.
+    # • cargar(ruta) / guardar(ruta) → archivo .npz con las columnas. Los ids se guardan como texto (unicode, "" si la
+    #   fila no tiene id) para poder leer el archivo sin pickle (allow_pickle=False).
+    # • agregar(...) → suma carreras al final (las columnas crecen al doble cuando se llenan, no en cada carga).
+    # • ritmos() → min/km de todas las carreras, redondeado a 2 decimales igual que calcular_ritmo().
+    # • percentiles(q), histograma(intervalos, rango), totales_semanales().
+# Reglas de negocio
+    # • Las mismas que Actividad/Carrera: duración ≥ 1 minuto y distancia > 0; si alguna fila no cumple no se carga nada.
+    # • Duraciones y distancias NaN o infinitas se rechazan (NaN pasaría el chequeo de ≥ 1).
+    # • Las semanas empiezan el lunes.
+"""---------------------------------------------------------------------------------------------------------------------------------------------------------------------"""
+import numpy as np
+
+
+def _validar(duraciones: np.ndarray, distancias: np.ndarray):
+    # NaN no cumple ninguna comparación (NaN < 1 es False): por eso se revisa aparte que todo sea finito
+    finitas = np.isfinite(duraciones)
+    if not finitas.all():
+        raise ValueError(f"La duración debe ser un número finito (fila {int(np.argmin(finitas))}).")
+    if (duraciones < 1).any():
+        raise ValueError(f"La duración mínima aceptada es 1 minuto (fila {int(np.argmax(duraciones < 1))}).")
+    finitas = np.isfinite(distancias)
+    if not finitas.all():
+        raise ValueError(f"La distancia debe ser un número finito (fila {int(np.argmin(finitas))}).")
+    if not (distancias > 0).all():
+        raise Exception(f"La distancia debe ser positiva (mayor que 0) (fila {int(np.argmin(distancias > 0))}).")
+
+
+class RegistroEntrenamiento:
+
+    def __init__(self, duraciones=(), distancias=(), fechas=None, ids=None):
+        self.__cantidad = 0
+        self.__duracion = np.empty(0, dtype=np.float64)
+        self.__distancia = np.empty(0, dtype=np.float64)
+        self.__fecha = np.empty(0, dtype="datetime64[s]")
+        self.__ids = np.empty(0, dtype=object)
+        self.agregar(duraciones, distancias, fechas, ids)
+
+    def __len__(self):
+        return self.__cantidad
+
+    """ Getters----------------------------------------------------------------------------------------------------------------------------------------------------------"""
+    # Vistas de solo lectura sobre la parte usada de cada columna (sin copiar)
+    @property
+    def duracion_min(self) -> np.ndarray:
+        return self.__solo_lectura(self.__duracion)
+
+    @property
+    def distancia_km(self) -> np.ndarray:
+        return self.__solo_lectura(self.__distancia)
+
+    @property
+    def fechas(self) -> np.ndarray:
+        return self.__solo_lectura(self.__fecha)
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self.__solo_lectura(self.__ids)
+
+    """ Métodos----------------------------------------------------------------------------------------------------------------------------------------------------------"""
+    def __solo_lectura(self, columna: np.ndarray) -> np.ndarray:
+        vista = columna[:self.__cantidad]
+        vista.flags.writeable = False
+        return vista
+
+    def __reservar(self, necesarias: int):
+        capacidad = len(self.__duracion)
+        if necesarias <= capacidad:
+            return
+        nueva = max(necesarias, 2 * capacidad, 16)
+        for nombre, vacio in (("duracion", 0.0), ("distancia", 0.0), ("fecha", np.datetime64("NaT")), ("ids", None)):
+            atributo = f"_RegistroEntrenamiento__{nombre}"
+            vieja = getattr(self, atributo)
+            columna = np.full(nueva, vacio, dtype=vieja.dtype)
+            columna[:self.__cantidad] = vieja[:self.__cantidad]
+            setattr(self, atributo, columna)
+
+    def agregar(self, duraciones, distancias, fechas=None, ids=None):
+        duraciones = np.asarray(duraciones, dtype=np.float64).ravel()
+        distancias = np.asarray(distancias, dtype=np.float64).ravel()
+        n = len(duraciones)
+        if len(distancias) != n:
+            raise ValueError("Las columnas de duración y distancia deben tener el mismo largo.")
+        if fechas is not None and len(fechas) != n:
+            raise ValueError("La columna de fechas debe tener el mismo largo que las demás.")
+        if ids is not None and len(ids) != n:
+            raise ValueError("La columna de ids debe tener el mismo largo que las demás.")
+        _validar(duraciones, distancias)
+
+        self.__reservar(self.__cantidad + n)
+        desde, hasta = self.__cantidad, self.__cantidad + n
+        self.__duracion[desde:hasta] = duraciones
+        self.__distancia[desde:hasta] = distancias
+        self.__fecha[desde:hasta] = np.datetime64("NaT") if fechas is None else np.asarray(fechas, dtype="datetime64[s]")
+        self.__ids[desde:hasta] = None if ids is None else list(ids)
+        self.__cantidad = hasta
+
+    @classmethod
+    def desde_carreras(cls, carreras):
+        carreras = list(carreras)
+        return cls(
+            [c.duracion_min for c in carreras],
+            [c.distancia_km for c in carreras],
+            # La fecha de la carrera es la de su evento de creación en historial_eventos
+            [c.historial_eventos[0]["fecha"].replace(" ", "T") for c in carreras],
+            [c.id_actividad for c in carreras],
+        )
+
+    @classmethod
+    def cargar(cls, ruta: str):
+        with np.load(ruta, allow_pickle=False) as datos:
+            ids = [id_actividad or None for id_actividad in datos["ids"].tolist()]
+            return cls(datos["duracion_min"], datos["distancia_km"], datos["fechas"], ids)
+
+    def guardar(self, ruta: str):
+        ids = np.array(["" if id_actividad is None else str(id_actividad) for id_actividad in self.ids.tolist()], dtype=np.str_)
+        np.savez(ruta, duracion_min=self.duracion_min, distancia_km=self.distancia_km, fechas=self.fechas, ids=ids)
+
+    def ritmos(self) -> np.ndarray:
+        # Igual que calcular_ritmo(): duracion_min / distancia_km redondeado a 2 decimales
+        return np.round(self.duracion_min / self.distancia_km, 2)
+
+    def percentiles(self, q) -> np.ndarray:
+        if self.__cantidad == 0:
+            raise Exception("No hay carreras registradas para calcular percentiles.")
+        return np.percentile(self.ritmos(), q)
+
+    def histograma(self, intervalos=20, rango: tuple = None) -> tuple:
+        # Devuelve (cantidades, bordes) de los ritmos, como np.histogram
+        return np.histogram(self.ritmos(), bins=intervalos, range=rango)
+
+    def totales_semanales(self) -> dict:
+        # Solo se cuentan las carreras con fecha; las semanas van ordenadas
+        con_fecha = ~np.isnat(self.fechas)
+        dias = self.fechas[con_fecha].astype("datetime64[D]").astype(np.int64)
+        lunes = dias - (dias + 3) % 7 # el 1970-01-01 fue jueves
+        semanas, posicion = np.unique(lunes, return_inverse=True)
+        return {
+            "semana": semanas.astype("datetime64[D]"),
+            "carreras": np.bincount(posicion, minlength=len(semanas)),
+            "distancia_km": np.bincount(posicion, weights=self.distancia_km[con_fecha], minlength=len(semanas)),
+            "duracion_min": np.bincount(posicion, weights=self.duracion_min[con_fecha], minlength=len(semanas)),
+        }
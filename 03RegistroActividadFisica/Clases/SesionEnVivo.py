@@ -0,0 +1,116 @@
+# Sesión en vivo de una Carrera: recibe la distancia y el tiempo cada segundo (o más seguido) mientras se corre.
+# Datos
+    # • carrera a la que pertenece la sesión.
+    # • última muestra (segundos desde el inicio, km acumulados) y una ventana corta de muestras para el ritmo instantáneo.
+    # • próximo punto de control por distancia (resolucion_km) y/o por tiempo (resolucion_min).
+# Operaciones
+    # • registrar_muestra(segundos, distancia_km) → O(1); no escribe nada en la Carrera salvo al pasar un punto de control.
+    # • escuchar(fuente) → corrutina que consume un iterable asíncrono de (segundos, distancia_km) hasta que termina.
+    # • ritmo_actual / ritmo_instantaneo → min/km de toda la sesión y de los últimos ventana_seg segundos, en O(1).
+    # • terminar() → deja el último punto de control con los valores finales.
+# Reglas de negocio
+    # • Las muestras son acumuladas desde el inicio de la sesión y no pueden ir hacia atrás.
+    # • En cada punto de control la Carrera queda con esa distancia y duración (min enteros, ≥ 1) y se registra un evento
+    #   en historial_eventos y otro en eventos_registro, sin imprimir. Entre puntos de control no se escribe nada.
+    # • No se escribe un punto de control mientras la distancia sea 0 (la Carrera exige distancia > 0).
+"""---------------------------------------------------------------------------------------------------------------------------------------------------------------------"""
+from collections import deque
+import math
+
+
+class SesionEnVivo:
+
+    def __init__(self, carrera, resolucion_km: float = 1.0, resolucion_min: float = None, ventana_seg: float = 30):
+        if resolucion_km is None and resolucion_min is None:
+            raise ValueError("Debe indicar una resolución por distancia, por tiempo o ambas.")
+        if (resolucion_km is not None and resolucion_km <= 0) or (resolucion_min is not None and resolucion_min <= 0):
+            raise ValueError("La resolución de los puntos de control debe ser mayor a 0.")
+        if ventana_seg <= 0:
+            raise ValueError("La ventana del ritmo instantáneo debe ser mayor a 0.")
+
+        self.__carrera = carrera
+        self.__resolucion_km = resolucion_km
+        self.__resolucion_seg = None if resolucion_min is None else resolucion_min * 60
+        self.__ventana_seg = ventana_seg
+        self.__segundos = 0.0
+        self.__distancia = 0.0
+        self.__ventana = deque() # (segundos, km) de los últimos ventana_seg segundos
+        self.__proximo_km = math.inf if resolucion_km is None else resolucion_km
+        self.__proximo_seg = math.inf if self.__resolucion_seg is None else self.__resolucion_seg
+        self.__puntos_control = 0
+        self.__terminada = False
+
+    """ Getters----------------------------------------------------------------------------------------------------------------------------------------------------------"""
+    @property
+    def carrera(self):
+        return self.__carrera
+
+    @property
+    def distancia_km(self) -> float:
+        return self.__distancia
+
+    @property
+    def segundos(self) -> float:
+        return self.__segundos
+
+    @property
+    def puntos_control(self) -> int:
+        return self.__puntos_control
+
+    @property
+    def ritmo_actual(self):
+        # min/km desde el inicio de la sesión; None si todavía no hay distancia
+        if self.__distancia <= 0:
+            return None
+        return round(self.__segundos / 60 / self.__distancia, 2)
+
+    @property
+    def ritmo_instantaneo(self):
+        # min/km entre la muestra más vieja y la más nueva de la ventana; None si en la ventana no hubo avance
+        if len(self.__ventana) < 2:
+            return None
+        (segundos_inicio, km_inicio), (segundos_fin, km_fin) = self.__ventana[0], self.__ventana[-1]
+        if km_fin <= km_inicio:
+            return None
+        return round((segundos_fin - segundos_inicio) / 60 / (km_fin - km_inicio), 2)
+
+    """ Métodos----------------------------------------------------------------------------------------------------------------------------------------------------------"""
+    def registrar_muestra(self, segundos: float, distancia_km: float):
+        if self.__terminada:
+            raise Exception("La sesión en vivo ya terminó.")
+        if segundos < self.__segundos or distancia_km < self.__distancia:
+            raise ValueError("Las muestras son acumuladas: el tiempo y la distancia no pueden disminuir.")
+
+        self.__segundos = segundos
+        self.__distancia = distancia_km
+        self.__ventana.append((segundos, distancia_km))
+        # Cada muestra entra y sale de la ventana una sola vez: O(1) amortizado
+        while self.__ventana[0][0] < segundos - self.__ventana_seg:
+            self.__ventana.popleft()
+
+        if distancia_km >= self.__proximo_km or segundos >= self.__proximo_seg:
+            self.__punto_control()
+
+    def __punto_control(self):
+        if self.__distancia <= 0:
+            return
+        self.__carrera._registrar_punto_control(self.__distancia, max(1, round(self.__segundos / 60)))
+        self.__puntos_control += 1
+        # El próximo punto es el siguiente múltiplo de la resolución (si una muestra saltó varios, se escribe uno solo)
+        if self.__resolucion_km is not None:
+            self.__proximo_km = (math.floor(self.__distancia / self.__resolucion_km) + 1) * self.__resolucion_km
+        if self.__resolucion_seg is not None:
+            self.__proximo_seg = (math.floor(self.__segundos / self.__resolucion_seg) + 1) * self.__resolucion_seg
+
+    async def escuchar(self, fuente):
+        async for segundos, distancia_km in fuente:
+            self.registrar_muestra(segundos, distancia_km)
+        self.terminar()
+
+    def terminar(self):
+        if self.__terminada:
+            return
+        carrera = self.__carrera
+        if self.__distancia > 0 and (carrera.distancia_km, carrera.duracion_min) != (self.__distancia, max(1, round(self.__segundos / 60))):
+            self.__punto_control()
+        self.__terminada = True